@@ -7,51 +7,143 @@ Chat Endpoint
 Handles user queries via the Agentic RAG pipeline.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.core.database import AsyncSessionLocal
 from app.schemas.chat_schema import ChatRequest, ChatResponse, Citation
 from app.services.vector_store import VectorStoreService
 from app.services.llm_agent import RAGAgent
+from app.services.query_text import normalize_query, make_snippet
+from app.services.single_flight import SingleFlight
+from app.services.admission import admission, AdmissionRejected, Priority
 
 router = APIRouter()
 
+# Identical questions asked concurrently share one agent execution
+chat_flights = SingleFlight("chat")
+
+
+def flight_key(message: str) -> str:
+    """
+    Dedup key for a chat request.
+    Retrieval is not scoped per user or collection yet; once it is,
+    that scope must become part of this key.
+    """
+    return normalize_query(message)
+
+
+def overloaded(e: AdmissionRejected) -> HTTPException:
+    """Load shedding: fail fast with a hint instead of queueing past the SLO."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+def format_citations(result: dict) -> list:
+    """Builds citations from the agent state (only populated for RAG answers)."""
+    citations = []
+    if result["intent"] == "search":
+        for doc in result["documents"]:
+            # Show the part of the chunk that actually matches the question
+            snippet, highlights = make_snippet(doc["content"], result.get("question", ""))
+            citations.append(Citation(
+                filename=doc["source"],
+                page=doc.get("page", 0),
+                text_snippet=snippet,
+                highlights=highlights,
+                score=doc.get("score", 0.0)
+            ))
+    return citations
+
+
+async def run_agent(message: str) -> dict:
+    """
+    Body of a shared chat flight. It runs detached from the request that
+    started it, so it owns its DB session: the leader disconnecting (and its
+    request-scoped session closing) must not break the followers.
+    """
+    async with AsyncSessionLocal() as session:
+        return await RAGAgent(VectorStoreService(session=session)).run(message)
+
+
+async def stream_agent(message: str):
+    """Streaming counterpart of `run_agent`; the session lives until the last state."""
+    async with AsyncSessionLocal() as session:
+        async for state in RAGAgent(VectorStoreService(session=session)).stream(message):
+            yield state
+
+
 @router.post(
     "/",
     response_model=ChatResponse,
     summary="Chat with Documents",
     description="Intelligent route that decides to search documents or chat casually."
 )
-async def chat_endpoint(
-    request: ChatRequest,
-    db: AsyncSession = Depends(get_db)
-):
+async def chat_endpoint(request: ChatRequest):
     try:
-        # 1. Init Dependencies
-        vector_store = VectorStoreService(session=db)
-        agent = RAGAgent(vector_store)
-
-        # 2. Run LangGraph Agent
-        result = await agent.run(request.message)
-
-        # 3. Format Citations (if RAG was used)
-        citations = []
-        if result["intent"] == "search":
-            for doc in result["documents"]:
-                citations.append(Citation(
-                    filename=doc["source"],
-                    page=doc.get("page", 0),
-                    text_snippet=doc["content"][:100] + "...",
-                    score=doc.get("score", 0.0)
-                ))
-
-        # 4. Return Response
+        # 1. Run LangGraph Agent (or join an identical in-flight run)
+        # Dependencies are built lazily so followers never construct them
+        result = await chat_flights.do(flight_key(request.message), lambda: run_agent(request.message))
+
+        # 2. Format Citations (if RAG was used) & Return Response
         return ChatResponse(
             answer=result["answer"],
             intent=result["intent"],
-            citations=citations
+            citations=format_citations(result)
         )
 
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="The language model did not answer in time.")
     except Exception as e:
         print(f"Chat Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/stream",
+    summary="Chat with Documents (Streaming)",
+    description="Same agent as POST /chat/, streamed as NDJSON progress events: intent, citations, answer."
+)
+async def chat_stream_endpoint(request: ChatRequest):
+    # Once streaming starts the status code is fixed, so shed load up front.
+    # Joining a running flight makes no LLM call of its own: never shed that
+    key = flight_key(request.message)
+    if not chat_flights.in_flight(key):
+        try:
+            admission.llm.check(Priority.INTERACTIVE)
+        except AdmissionRejected as e:
+            raise overloaded(e)
+
+    events = chat_flights.subscribe(key, lambda: stream_agent(request.message))
+
+    async def ndjson():
+        sent = set()
+        state = None
+        try:
+            async for state in events:
+                if state.get("intent") and "intent" not in sent:
+                    sent.add("intent")
+                    yield json.dumps({"event": "intent", "intent": state["intent"]}) + "\n"
+                if state.get("documents") and "citations" not in sent:
+                    sent.add("citations")
+                    citations = [c.model_dump() for c in format_citations(state)]
+                    yield json.dumps({"event": "citations", "citations": citations}) + "\n"
+            response = ChatResponse(
+                answer=state["answer"],
+                intent=state["intent"],
+                citations=format_citations(state)
+            )
+            yield json.dumps({"event": "answer", **response.model_dump()}) + "\n"
+        except AdmissionRejected as e:
+            yield json.dumps({"event": "error", "detail": str(e), "retry_after": e.retry_after}) + "\n"
+        except Exception as e:
+            print(f"Chat Error: {e}")
+            yield json.dumps({"event": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
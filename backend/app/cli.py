@@ -0,0 +1,128 @@
+# File: documind-enterprise/backend/app/cli.py
+# Purpose: Operational commands that talk to the database directly (no HTTP).
+
+"""
+Command Line Interface
+----------------------
+Usage (from the backend directory / container):
+    python -m app.cli ingest ./archive/
+    python -m app.cli ingest ./archive.zip --checkpoint archive.ckpt
+    python -m app.cli rebuild-centroids
+    python -m app.cli snapshot export ./snapshots/2024-06-01
+    python -m app.cli snapshot import ./snapshots/2024-06-01 --replace
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+from app.core.database import engine, init_db, AsyncSessionLocal
+
+
+async def _ingest(args: argparse.Namespace) -> None:
+    # Imported lazily so `--help` stays fast
+    from app.services.bulk_ingest import BulkIngestPipeline
+
+    pipeline = BulkIngestPipeline(
+        source_path=args.source,
+        checkpoint_path=args.checkpoint or f"{args.source.rstrip('/')}.checkpoint",
+        parse_workers=args.parse_workers,
+        embed_workers=args.embed_workers,
+        write_workers=args.write_workers,
+        queue_size=args.queue_size,
+        report_interval=args.report_interval,
+    )
+    totals = await pipeline.run()
+    print(f"DONE:    {totals.files} files / {totals.chunks} chunks written.")
+
+
+async def _rebuild_centroids(args: argparse.Namespace) -> None:
+    from app.services.vector_store import VectorStoreService
+
+    async with AsyncSessionLocal() as session:
+        count = await VectorStoreService(session=session).rebuild_centroids()
+    print(f"DONE:    Rebuilt centroids for {count} documents.")
+
+
+async def _snapshot_export(args: argparse.Namespace) -> None:
+    from app.services.snapshot import SnapshotError, export_snapshot
+
+    try:
+        stats = await export_snapshot(Path(args.path), filename_prefix=args.prefix, batch_size=args.batch_size)
+    except SnapshotError as e:
+        raise SystemExit(f"ERROR:   {e}")
+    print(f"DONE:    Exported {stats.line()}")
+
+
+async def _snapshot_import(args: argparse.Namespace) -> None:
+    from app.services.snapshot import SnapshotError, import_snapshot
+
+    try:
+        stats = await import_snapshot(
+            Path(args.path),
+            replace=args.replace,
+            batch_size=args.batch_size,
+            hnsw=args.hnsw,
+            maintenance_work_mem=args.maintenance_work_mem,
+        )
+    except SnapshotError as e:
+        raise SystemExit(f"ERROR:   {e}")
+    print(f"DONE:    Imported {stats.line()}")
+
+
+async def _run(handler, args: argparse.Namespace) -> None:
+    # Per-statement SQL logging would dominate a bulk job's runtime
+    engine.echo = False
+    try:
+        await init_db()
+        await handler(args)
+    finally:
+        await engine.dispose()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="DocuMind operational commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Bulk-ingest a directory or .zip archive.")
+    ingest.add_argument("source", help="Directory (walked recursively) or .zip archive.")
+    ingest.add_argument("--checkpoint", help="Resume file (default: <source>.checkpoint).")
+    ingest.add_argument("--parse-workers", type=int, default=None, help="Parser processes (default: CPU count).")
+    ingest.add_argument("--embed-workers", type=int, default=4, help="Concurrent embedding requests.")
+    ingest.add_argument("--write-workers", type=int, default=2, help="Concurrent DB writers (one session each).")
+    ingest.add_argument("--queue-size", type=int, default=64, help="Files buffered between stages.")
+    ingest.add_argument("--report-interval", type=float, default=5.0, help="Seconds between throughput reports.")
+    ingest.set_defaults(handler=_ingest)
+
+    centroids = commands.add_parser("rebuild-centroids", help="Recompute per-document centroids (hierarchical retrieval).")
+    centroids.set_defaults(handler=_rebuild_centroids)
+
+    snapshot = commands.add_parser("snapshot", help="Export/import chunks + embeddings as a compact binary snapshot.")
+    snapshot_commands = snapshot.add_subparsers(dest="snapshot_command", required=True)
+
+    export = snapshot_commands.add_parser("export", help="Write all embedded chunks to a new snapshot directory.")
+    export.add_argument("path", help="Target directory (must not already hold a snapshot).")
+    export.add_argument("--prefix", default="", help="Only export filenames starting with this prefix.")
+    export.add_argument("--batch-size", type=int, default=10_000, help="Rows fetched per round trip.")
+    export.set_defaults(handler=_snapshot_export)
+
+    load = snapshot_commands.add_parser("import", help="Bulk-load a snapshot with COPY and rebuild indexes.")
+    load.add_argument("path", help="Snapshot directory.")
+    load.add_argument("--replace", action="store_true", help="Truncate existing chunks first.")
+    load.add_argument("--batch-size", type=int, default=20_000, help="Rows per COPY.")
+    load.add_argument(
+        "--hnsw", action="store_true",
+        help="Also build an HNSW index (approximate search; filtered hierarchical queries may return fewer hits)."
+    )
+    load.add_argument("--maintenance-work-mem", default="1GB", help="Postgres memory for the index rebuild.")
+    load.set_defaults(handler=_snapshot_import)
+
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_args(argv)
+    asyncio.run(_run(args.handler, args))
+
+
+if __name__ == "__main__":
+    main()
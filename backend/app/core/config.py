@@ -11,6 +11,12 @@ from typing import List, Union, Optional
 from pydantic import AnyHttpUrl, PostgresDsn, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+OPENAI_EMBEDDING_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "DocuMind Enterprise"
     API_V1_STR: str = "/api/v1"
@@ -27,6 +33,77 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     EMBEDDING_MODEL: str = "text-embedding-3-small"
 
+    # Embedding Backend: "openai" | "onnx" | "hashing" (see app/services/embeddings.py)
+    # Changing the backend changes the vector dimension: re-ingest afterwards.
+    EMBEDDING_BACKEND: str = "openai"
+    EMBEDDING_DIM: Optional[int] = None  # Overrides the backend's default dimension
+    ONNX_MODEL_PATH: Optional[str] = None  # Directory with model.onnx + tokenizer.json
+    EMBEDDING_BATCH_SIZE: int = 32  # Local backends only
+    EMBEDDING_THREADS: int = 4  # Local backends only
+
+    # Query Embedding Cache (see app/services/query_cache.py)
+    # L1: per-worker LRU. L2 (shared by all workers): "none" | "mmap" | "redis"
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_ENTRIES: int = 4096
+    QUERY_CACHE_SHARED: str = "none"
+    QUERY_CACHE_MMAP_PATH: str = "/tmp/documind-query-embeddings.bin"
+    QUERY_CACHE_MMAP_SLOTS: int = 16384  # File size ~ slots x (dimension x 4 + 20) bytes
+    QUERY_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    QUERY_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # Redis only
+
+    # Chat Completions (see app/services/resilient_llm.py)
+    LLM_MODEL: str = "gpt-4o-mini"
+    LLM_BASE_URL: Optional[str] = None  # OpenAI-compatible endpoint (default: api.openai.com)
+    LLM_ROUTER_TIMEOUT_SECONDS: float = 10.0
+    LLM_GENERATE_TIMEOUT_SECONDS: float = 60.0
+    # Hedging: re-send to the secondary once the primary exceeds its p95 latency.
+    # A hedge needs a free LLM_MAX_CONCURRENCY slot (never queues), so it cannot raise provider concurrency
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_MODEL: Optional[str] = None  # Default: LLM_MODEL
+    LLM_HEDGE_BASE_URL: Optional[str] = None  # Default: LLM_BASE_URL (e.g. another region)
+    LLM_HEDGE_MAX_RATIO: float = 0.1
+    LLM_HEDGE_INITIAL_DELAY_SECONDS: float = 2.0
+
+    # Retrieval: "flat" (top-k over all chunks) | "hierarchical"
+    # (top-M documents by centroid first, then top-k chunks inside them)
+    RETRIEVAL_MODE: str = "flat"
+    RETRIEVAL_TOP_DOCUMENTS: int = 8
+    CENTROID_REFRESH_SECONDS: float = 300.0
+
+    # Admission Control (per worker)
+    # Caps concurrent provider calls; interactive requests queued longer
+    # than the SLO are rejected with 429 instead of slowing everyone down.
+    LLM_MAX_CONCURRENCY: int = 8
+    EMBEDDING_MAX_CONCURRENCY: int = 16
+    ADMISSION_QUEUE_SLO_SECONDS: float = 5.0
+
+    def embedding_dimension_for(self, backend: str) -> int:
+        """Vector size produced by `backend` under the current settings."""
+        if self.EMBEDDING_DIM:
+            return self.EMBEDDING_DIM
+        if backend == "openai":
+            return OPENAI_EMBEDDING_DIMENSIONS.get(self.EMBEDDING_MODEL, 1536)
+        if backend == "onnx":
+            return 384  # all-MiniLM-L6-v2 / bge-small class models
+        return 768
+
+    @computed_field
+    @property
+    def EMBEDDING_DIMENSION(self) -> int:
+        return self.embedding_dimension_for(self.EMBEDDING_BACKEND)
+
+    @computed_field
+    @property
+    def EMBEDDING_MODEL_ID(self) -> str:
+        """Names the vector space; embeddings with different ids are not comparable."""
+        if self.EMBEDDING_BACKEND == "openai":
+            model = self.EMBEDDING_MODEL
+        elif self.EMBEDDING_BACKEND == "onnx":
+            model = (self.ONNX_MODEL_PATH or "").rstrip("/").rsplit("/", 1)[-1]
+        else:
+            return f"{self.EMBEDDING_BACKEND}:{self.EMBEDDING_DIMENSION}"
+        return f"{self.EMBEDDING_BACKEND}:{model}:{self.EMBEDDING_DIMENSION}"
+
     @computed_field
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
@@ -9,6 +9,7 @@ Provides dependency injection for FastAPI endpoints.
 """
 
 from collections.abc import AsyncGenerator
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
 
@@ -45,4 +46,36 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+async def init_db() -> None:
+    """
+    Prepares the schema: enables pgvector, then creates missing tables.
+    Shared by the API lifespan and the CLI.
+    """
+    # Imported here so every model is registered on Base.metadata
+    from app.models.base import Base
+    from app.models import document  # noqa: F401
+
+    # 1. FIRST: Enable Vector Extension
+    # We must do this before creating tables, otherwise the 'vector' type won't exist.
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        await session.commit()
+
+    # 2. SECOND: Create Database Tables
+    # Now that 'vector' exists, we can create the table safely.
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+        # 3. Existing tables are not altered: catch a backend/dimension switch early
+        existing_dim = await conn.scalar(text(
+            "SELECT atttypmod FROM pg_attribute "
+            "WHERE attrelid = 'document_chunks'::regclass AND attname = 'embedding'"
+        ))
+        if existing_dim != settings.EMBEDDING_DIMENSION:
+            raise RuntimeError(
+                f"document_chunks.embedding is vector({existing_dim}) but the "
+                f"'{settings.EMBEDDING_BACKEND}' backend produces {settings.EMBEDDING_DIMENSION} dims. "
+                "Drop/migrate the table and re-ingest after changing EMBEDDING_BACKEND."
+            )
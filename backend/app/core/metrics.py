@@ -0,0 +1,117 @@
+# File: documind-enterprise/backend/app/core/metrics.py
+# Purpose: Lightweight in-process metrics (counters, gauges, latency windows) exposed at /metrics.
+
+"""
+Metrics Module
+--------------
+A dependency-free registry for operational metrics.
+Values are per-process (one registry per uvicorn worker).
+
+Usage:
+    from app.core.metrics import metrics
+    metrics.counter("singleflight_followers_total").inc()
+    metrics.histogram("llm_latency_seconds").observe(0.42)
+"""
+
+import math
+from collections import deque
+from typing import Dict
+
+
+class Counter:
+    """Monotonically increasing value."""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def snapshot(self) -> float:
+        return self.value
+
+
+class Gauge:
+    """Value that can go up and down (queue depth, in-flight requests)."""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def snapshot(self) -> float:
+        return self.value
+
+
+class Histogram:
+    """
+    Count/sum over all observations plus quantiles over a sliding window
+    of the most recent `window` samples.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Nearest-rank quantile of the recent window (0.0 if empty)."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(0, math.ceil(q * len(ordered)) - 1)
+        return ordered[rank]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.mean, 6),
+            "p50": round(self.quantile(0.50), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+        }
+
+
+class MetricsRegistry:
+    """Get-or-create access to named metrics."""
+
+    def __init__(self):
+        self._counters: Dict[str, Counter] = {}
+        self._gauges: Dict[str, Gauge] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def counter(self, name: str) -> Counter:
+        return self._counters.setdefault(name, Counter())
+
+    def gauge(self, name: str) -> Gauge:
+        return self._gauges.setdefault(name, Gauge())
+
+    def histogram(self, name: str) -> Histogram:
+        return self._histograms.setdefault(name, Histogram())
+
+    def snapshot(self) -> dict:
+        return {
+            "counters": {k: v.snapshot() for k, v in sorted(self._counters.items())},
+            "gauges": {k: v.snapshot() for k, v in sorted(self._gauges.items())},
+            "histograms": {k: v.snapshot() for k, v in sorted(self._histograms.items())},
+        }
+
+
+metrics = MetricsRegistry()
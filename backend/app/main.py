@@ -9,12 +9,10 @@ Entry point for the FastAPI application.
 
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from sqlalchemy import text
 from app.core.config import settings
-from app.core.database import engine, AsyncSessionLocal
-from app.models.base import Base
-# IMPORTANT: Import models so Base.metadata knows they exist
-from app.models.document import DocumentChunk 
+from app.core.database import engine, init_db, AsyncSessionLocal
+from app.core.metrics import metrics
+from app.services.centroid_index import centroid_index
 from app.api.v1.endpoints import documents, chat
 
 @asynccontextmanager
@@ -22,21 +20,19 @@ async def lifespan(app: FastAPI):
     # --- Startup ---
     print(f"INFO:    Starting {settings.PROJECT_NAME}...")
     
-    # 1. FIRST: Enable Vector Extension
-    # We must do this before creating tables, otherwise the 'vector' type won't exist.
-    async with AsyncSessionLocal() as session:
-        try:
-            await session.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-            await session.commit()
-            print("INFO:    Database connection established & Vector extension verified.")
-        except Exception as e:
-            print(f"ERROR:   Database connection failed: {e}")
-            raise e
-
-    # 2. SECOND: Create Database Tables
-    # Now that 'vector' exists, we can create the table safely.
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Enable pgvector & create tables
+    try:
+        await init_db()
+        print("INFO:    Database connection established & Vector extension verified.")
+    except Exception as e:
+        print(f"ERROR:   Database connection failed: {e}")
+        raise e
+
+    # Warm the in-memory document index so the first query doesn't pay for it
+    if settings.RETRIEVAL_MODE == "hierarchical":
+        async with AsyncSessionLocal() as session:
+            await centroid_index.load(session)
+        print(f"INFO:    Loaded {len(centroid_index)} document centroids.")
             
     yield
     
@@ -58,6 +54,11 @@ app.include_router(chat.router, prefix=f"{settings.API_V1_STR}/chat", tags=["Cha
 async def health_check():
     return {"status": "healthy", "version": "0.1.0"}
 
+@app.get("/metrics")
+async def metrics_snapshot():
+    """Per-worker operational metrics (single-flight, queues, latencies)."""
+    return metrics.snapshot()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to DocuMind API", "docs": "/docs"}
\ No newline at end of file
@@ -14,6 +14,7 @@ from sqlalchemy import Column, String, DateTime, Text, Integer, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from pgvector.sqlalchemy import Vector
 from app.models.base import Base
+from app.core.config import settings
 
 class DocumentChunk(Base):
     """
@@ -25,7 +26,7 @@ class DocumentChunk(Base):
         chunk_index (int): Sequential index of the chunk in the document.
         content (str): The actual text content of the chunk.
         metadata (dict): Additional context (page number, author, etc).
-        embedding (Vector): 1536-dimensional vector (OpenAI standard).
+        embedding (Vector): settings.EMBEDDING_DIMENSION-sized vector (1536 for OpenAI).
         created_at (datetime): Timestamp of ingestion.
     """
     __tablename__ = "document_chunks"
@@ -38,11 +39,35 @@ class DocumentChunk(Base):
     # Storing flexible metadata (page_num, source_path) as JSON
     doc_metadata = Column(JSON, nullable=True)
     
-    # 1536 is the dimension size for OpenAI text-embedding-3-small/large
+    # Dimension follows the configured embedding backend
+    # (1536 for OpenAI text-embedding-3-small, the default)
     # This column requires the 'vector' extension in Postgres
-    embedding = Column(Vector(1536))
+    embedding = Column(Vector(settings.EMBEDDING_DIMENSION))
     
     created_at = Column(DateTime, default=datetime.utcnow)
 
     def __repr__(self):
-        return f"<DocumentChunk(id={self.id}, filename='{self.filename}', index={self.chunk_index})>"
\ No newline at end of file
+        return f"<DocumentChunk(id={self.id}, filename='{self.filename}', index={self.chunk_index})>"
+
+
+class DocumentCentroid(Base):
+    """
+    Document-level index: one mean embedding per source file.
+    Used as the coarse stage of hierarchical retrieval (pick documents first,
+    then rank chunks only inside them). Maintained by VectorStoreService.write_documents.
+    
+    Attributes:
+        filename (str): Primary Key; matches DocumentChunk.filename.
+        chunk_count (int): Number of chunks averaged into the centroid.
+        embedding (Vector): Mean of the document's chunk embeddings.
+        updated_at (datetime): Last time chunks were added.
+    """
+    __tablename__ = "document_centroids"
+
+    filename = Column(String, primary_key=True)
+    chunk_count = Column(Integer, nullable=False)
+    embedding = Column(Vector(settings.EMBEDDING_DIMENSION), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DocumentCentroid(filename='{self.filename}', chunks={self.chunk_count})>"
@@ -7,7 +7,7 @@ Chat Schema
 DTOs for the Chat Endpoint.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from pydantic import BaseModel
 
 class ChatRequest(BaseModel):
@@ -25,6 +25,7 @@ class Citation(BaseModel):
     page: int
     text_snippet: str
     score: float
+    highlights: List[Tuple[int, int]] = [] # (start, end) of query terms in text_snippet
 
 class ChatResponse(BaseModel):
     """
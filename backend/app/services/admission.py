@@ -0,0 +1,177 @@
+# File: documind-enterprise/backend/app/services/admission.py
+# Purpose: Admission control for outbound LLM / embedding calls. Caps concurrency and sheds load early.
+
+"""
+Admission Control
+-----------------
+Every call to the LLM or embedding provider must hold a slot from its budget.
+When a budget is full, callers queue by priority (interactive chat before
+ingestion). Interactive callers carry a deadline (the queueing SLO): if the
+estimated wait already exceeds it they are rejected immediately, and if the
+deadline passes while queued they are rejected then. The API turns
+`AdmissionRejected` into 429 + Retry-After.
+
+Usage:
+    async with admission.llm.slot(Priority.INTERACTIVE):
+        answer = await chain.ainvoke(...)
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0
+    INGESTION = 1
+
+
+class AdmissionRejected(Exception):
+    """Raised when queueing would exceed the SLO. `retry_after` is in seconds."""
+
+    def __init__(self, budget: str, retry_after: float):
+        self.budget = budget
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"{budget} capacity exhausted, retry after {self.retry_after}s")
+
+
+class ConcurrencyBudget:
+    """
+    A priority-ordered semaphore with wait-time estimation.
+
+    Args:
+        name: Budget name used in metric names (admission_<name>_*).
+        limit: Maximum concurrent calls.
+        slo_seconds: Maximum queueing time for interactive callers.
+    """
+
+    # Assumed call duration until real samples exist
+    DEFAULT_SERVICE_SECONDS = 1.0
+
+    def __init__(self, name: str, limit: int, slo_seconds: float):
+        self.name = name
+        self.limit = limit
+        self.slo_seconds = slo_seconds
+        self.in_flight = 0
+        self.queued = 0
+        self._waiters = []  # heap of (priority, seq, future)
+        self._seq = itertools.count()
+
+        self._queue_depth = metrics.gauge(f"admission_{name}_queue_depth")
+        self._in_flight = metrics.gauge(f"admission_{name}_in_flight")
+        self._wait_time = metrics.histogram(f"admission_{name}_wait_seconds")
+        self._service_time = metrics.histogram(f"admission_{name}_service_seconds")
+        self._rejected = metrics.counter(f"admission_{name}_rejected_total")
+
+    def max_wait(self, priority: Priority) -> Optional[float]:
+        """Interactive work has a deadline; background ingestion just waits."""
+        return self.slo_seconds if priority == Priority.INTERACTIVE else None
+
+    def estimated_wait(self, priority: Priority) -> float:
+        """Rough queueing time for a new caller of `priority`."""
+        if self.in_flight < self.limit and not self.queued:
+            return 0.0
+        ahead = sum(1 for p, _, f in self._waiters if p <= priority and not f.done())
+        service = self._service_time.quantile(0.5) or self.DEFAULT_SERVICE_SECONDS
+        return (ahead + 1) * service / self.limit
+
+    def check(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """Fail fast (without queueing) if a new caller would miss its deadline."""
+        max_wait = self.max_wait(priority)
+        if max_wait is not None:
+            estimate = self.estimated_wait(priority)
+            if estimate > max_wait:
+                self._rejected.inc()
+                raise AdmissionRejected(self.name, estimate)
+
+    def try_acquire(self) -> bool:
+        """Takes a free slot without queueing (for optional extra calls); caller must release()."""
+        if self.in_flight < self.limit and not self.queued:
+            self._grant()
+            return True
+        return False
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE):
+        await self.acquire(priority)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._service_time.observe(time.perf_counter() - started)
+            self.release()
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        if self.in_flight < self.limit and not self.queued:
+            self._grant()
+            self._wait_time.observe(0.0)
+            return
+
+        self.check(priority)
+        max_wait = self.max_wait(priority)
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+        self._set_queued(+1)
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait({waiter}, timeout=max_wait)
+        except BaseException:
+            # Caller went away (e.g. client disconnect) while queued
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            self._abandon(waiter)
+            self._rejected.inc()
+            raise AdmissionRejected(self.name, self.estimated_wait(priority))
+        self._wait_time.observe(time.perf_counter() - queued_at)
+
+    def release(self) -> None:
+        # Hand the slot straight to the best waiter so nobody can barge in
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._set_queued(-1)
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+        self._in_flight.set(self.in_flight)
+
+    def _grant(self) -> None:
+        self.in_flight += 1
+        self._in_flight.set(self.in_flight)
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as we gave up: pass it on
+            self.release()
+        else:
+            waiter.cancel()
+            self._set_queued(-1)
+
+    def _set_queued(self, delta: int) -> None:
+        self.queued += delta
+        self._queue_depth.set(self.queued)
+
+
+class AdmissionController:
+    """Separate budgets so slow completions cannot starve query embeddings (and vice versa)."""
+
+    def __init__(self, llm_limit: int, embedding_limit: int, slo_seconds: float):
+        self.llm = ConcurrencyBudget("llm", llm_limit, slo_seconds)
+        self.embedding = ConcurrencyBudget("embedding", embedding_limit, slo_seconds)
+
+
+admission = AdmissionController(
+    llm_limit=settings.LLM_MAX_CONCURRENCY,
+    embedding_limit=settings.EMBEDDING_MAX_CONCURRENCY,
+    slo_seconds=settings.ADMISSION_QUEUE_SLO_SECONDS,
+)
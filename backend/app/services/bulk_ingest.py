@@ -0,0 +1,297 @@
+# File: documind-enterprise/backend/app/services/bulk_ingest.py
+# Purpose: Pipelined, resumable bulk loader for large document archives (bypasses HTTP).
+
+"""
+Bulk Ingest Pipeline
+--------------------
+Streams a directory or .zip archive straight into Postgres.
+
+Stages run concurrently and are connected by bounded asyncio Queues,
+so a slow stage applies back-pressure instead of buffering the whole archive:
+1. Read:  Loads raw file bytes (thread pool, disk I/O).
+2. Parse: Extracts text in a ProcessPoolExecutor (pypdf is CPU bound).
+3. Split: Chunks text with IngestionService's splitter.
+4. Embed: Generates vectors via VectorStoreService.embed_documents.
+5. Write: Inserts chunks and records the file in the checkpoint.
+"""
+
+import asyncio
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+from langchain_core.documents import Document
+from app.core.database import AsyncSessionLocal
+from app.services.ingestion import IngestionService, SUPPORTED_EXTENSIONS, parse_file_bytes
+from app.services.vector_store import VectorStoreService
+
+# Sentinel telling a stage worker that upstream is exhausted
+_STOP = object()
+
+
+@dataclass
+class FileItem:
+    """A single source file travelling through the pipeline."""
+    source: str
+    content: bytes = b""
+    text: str = ""
+    chunks: List[Document] = field(default_factory=list)
+    embeddings: List[List[float]] = field(default_factory=list)
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+    name: str
+    files: int = 0
+    chunks: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+
+    def line(self, elapsed: float) -> str:
+        elapsed = max(elapsed, 1e-9)
+        text = f"{self.name}: {self.files / elapsed:.1f} files/s"
+        if self.chunks:
+            text += f", {self.chunks / elapsed:.1f} chunks/s"
+        if self.failed:
+            text += f", {self.failed} failed"
+        return text
+
+
+class Checkpoint:
+    """
+    Append-only log of fully written sources.
+    One source per line; re-running with the same file skips everything listed.
+    Sources that failed in any stage go to `<path>.failed` (source<TAB>error)
+    and are retried on the next run.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.failed_path = self.path.with_name(self.path.name + ".failed")
+        self.done: Set[str] = set()
+        if self.path.exists():
+            self.done = {line for line in self.path.read_text("utf-8").splitlines() if line}
+        self._fh = None
+
+    def __contains__(self, source: str) -> bool:
+        return source in self.done
+
+    def mark(self, source: str) -> None:
+        if self._fh is None:
+            self._fh = self.path.open("a", encoding="utf-8")
+        self._fh.write(source + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self.done.add(source)
+
+    def mark_failed(self, source: str, error: Exception) -> None:
+        reason = " ".join(str(error).split())
+        with self.failed_path.open("a", encoding="utf-8") as fh:
+            fh.write(f"{source}\t{type(error).__name__}: {reason}\n")
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def discover_sources(path: str) -> Iterator[Tuple[str, Callable[[], bytes]]]:
+    """
+    Yields (source_name, loader) pairs for every supported file.
+    Directories are walked recursively; .zip archives are read member by member.
+    """
+    root = Path(path)
+    if root.is_file() and zipfile.is_zipfile(root):
+        archive = zipfile.ZipFile(root)
+        for member in sorted(archive.namelist()):
+            if member.endswith(SUPPORTED_EXTENSIONS):
+                yield member, (lambda m=member: archive.read(m))
+    elif root.is_dir():
+        for file_path in sorted(p for p in root.rglob("*") if p.is_file()):
+            if file_path.name.endswith(SUPPORTED_EXTENSIONS):
+                yield file_path.relative_to(root).as_posix(), file_path.read_bytes
+    else:
+        raise ValueError(f"Expected a directory or .zip archive, got: {path}")
+
+
+class BulkIngestPipeline:
+    def __init__(
+        self,
+        source_path: str,
+        checkpoint_path: str,
+        parse_workers: Optional[int] = None,
+        embed_workers: int = 4,
+        write_workers: int = 2,
+        queue_size: int = 64,
+        report_interval: float = 5.0
+    ):
+        self.source_path = source_path
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.embed_workers = embed_workers
+        self.write_workers = write_workers
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+
+        self.ingestion_service = IngestionService()
+        # Embedding needs no DB session; this instance is only used for its model
+        self.embedder = VectorStoreService(session=None)
+        self.stats = {
+            name: StageStats(name) for name in ("read", "parse", "split", "embed", "write")
+        }
+        self.skipped = 0
+
+    async def run(self) -> StageStats:
+        """Runs every stage to completion and returns the write-stage totals."""
+        q_parse = asyncio.Queue(self.queue_size)
+        q_split = asyncio.Queue(self.queue_size)
+        q_embed = asyncio.Queue(self.queue_size)
+        q_write = asyncio.Queue(self.queue_size)
+        self._queues = {"parse": q_parse, "split": q_split, "embed": q_embed, "write": q_write}
+
+        started = time.perf_counter()
+        reporter = asyncio.create_task(self._report(started))
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(self._read_stage(q_parse))
+                    tg.create_task(self._stage("parse", lambda item: self._parse(pool, item),
+                                               q_parse, q_split, self.parse_workers, 1))
+                    tg.create_task(self._stage("split", self._split,
+                                               q_split, q_embed, 1, self.embed_workers))
+                    tg.create_task(self._stage("embed", self._embed,
+                                               q_embed, q_write, self.embed_workers, self.write_workers))
+                    tg.create_task(self._write_stage(q_write))
+        finally:
+            reporter.cancel()
+            self.checkpoint.close()
+
+        self._print_report(time.perf_counter() - started, final=True)
+        return self.stats["write"]
+
+    # --- Stages ---
+
+    async def _read_stage(self, outbox: asyncio.Queue):
+        stats = self.stats["read"]
+        for source, loader in discover_sources(self.source_path):
+            if source in self.checkpoint:
+                self.skipped += 1
+                continue
+            t0 = time.perf_counter()
+            try:
+                content = await asyncio.to_thread(loader)
+            except Exception as e:
+                # e.g. a zip member with a bad CRC; the rest of the archive still loads
+                stats.failed += 1
+                self.checkpoint.mark_failed(source, e)
+                print(f"WARNING: [read] skipping {source}: {e}")
+                continue
+            finally:
+                stats.busy_seconds += time.perf_counter() - t0
+            stats.files += 1
+            await outbox.put(FileItem(source=source, content=content))
+        for _ in range(self.parse_workers):
+            await outbox.put(_STOP)
+
+    async def _stage(self, name, handler, inbox, outbox, workers: int, downstream_workers: int):
+        """Runs `workers` copies of `handler`, then signals the next stage."""
+        stats = self.stats[name]
+
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _STOP:
+                    return
+                t0 = time.perf_counter()
+                try:
+                    item = await handler(item)
+                except Exception as e:
+                    stats.failed += 1
+                    self.checkpoint.mark_failed(item.source, e)
+                    print(f"WARNING: [{name}] skipping {item.source}: {e}")
+                    continue
+                finally:
+                    stats.busy_seconds += time.perf_counter() - t0
+                if item is None:
+                    continue
+                stats.files += 1
+                stats.chunks += len(item.chunks)
+                await outbox.put(item)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        for _ in range(downstream_workers):
+            await outbox.put(_STOP)
+
+    async def _parse(self, pool: ProcessPoolExecutor, item: FileItem) -> Optional[FileItem]:
+        loop = asyncio.get_running_loop()
+        item.text = await loop.run_in_executor(pool, parse_file_bytes, item.source, item.content)
+        item.content = b""  # Release raw bytes early; only text moves on
+        if not item.text.strip():
+            raise ValueError("File content is empty or unreadable.")
+        return item
+
+    async def _split(self, item: FileItem) -> FileItem:
+        item.chunks = self.ingestion_service.split_text(item.text, source=item.source)
+        item.text = ""
+        return item
+
+    async def _embed(self, item: FileItem) -> FileItem:
+        item.embeddings = await self.embedder.embed_documents(item.chunks)
+        return item
+
+    async def _write_stage(self, inbox: asyncio.Queue):
+        stats = self.stats["write"]
+
+        async def worker():
+            # Each writer owns a session so inserts can overlap
+            async with AsyncSessionLocal() as session:
+                vector_service = VectorStoreService(session=session)
+                while True:
+                    item = await inbox.get()
+                    if item is _STOP:
+                        return
+                    t0 = time.perf_counter()
+                    try:
+                        count = await vector_service.write_documents(
+                            item.chunks, item.embeddings, replace_existing=True
+                        )
+                    except Exception as e:
+                        # e.g. Postgres rejecting a NUL byte pypdf extracted;
+                        # the session must be usable again for the next file
+                        await session.rollback()
+                        stats.failed += 1
+                        self.checkpoint.mark_failed(item.source, e)
+                        print(f"WARNING: [write] skipping {item.source}: {e}")
+                        continue
+                    finally:
+                        stats.busy_seconds += time.perf_counter() - t0
+                    self.checkpoint.mark(item.source)
+                    stats.files += 1
+                    stats.chunks += count
+
+        await asyncio.gather(*(worker() for _ in range(self.write_workers)))
+
+    # --- Reporting ---
+
+    async def _report(self, started: float):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self._print_report(time.perf_counter() - started)
+
+    def _print_report(self, elapsed: float, final: bool = False):
+        label = "DONE" if final else "INFO"
+        stages = " | ".join(s.line(elapsed) for s in self.stats.values())
+        print(f"{label}:    [{elapsed:.0f}s] {stages}")
+        if final:
+            print(f"{label}:    skipped {self.skipped} already-checkpointed files")
+            failed = sum(s.failed for s in self.stats.values())
+            if failed:
+                print(f"{label}:    {failed} files failed, "
+                      f"see {self.checkpoint.failed_path} (retried on the next run)")
+        else:
+            depths = ", ".join(f"{n}={q.qsize()}" for n, q in self._queues.items())
+            print(f"INFO:    queue depth: {depths}")
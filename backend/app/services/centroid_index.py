@@ -0,0 +1,152 @@
+# File: documind-enterprise/backend/app/services/centroid_index.py
+# Purpose: In-memory coarse index over per-document centroids (stage 1 of hierarchical retrieval).
+
+"""
+Centroid Index
+--------------
+Holds every document centroid as one contiguous float32 matrix, so picking the
+top-M documents for a query is a single matrix-vector product (no DB round trip).
+
+Memory: documents x dimension x 4 bytes (50k docs @ 1536 dims ~ 300 MB per worker).
+
+Freshness: a worker sees its own ingests immediately (`upsert`) and reloads
+the table from Postgres every CENTROID_REFRESH_SECONDS to pick up writes
+made by other workers or the bulk-ingest CLI. Only the first load is waited
+for; later reloads run in a background task (own DB session, matrix built in
+a thread) while searches keep using the current table, which is then swapped
+out in one assignment.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.document import DocumentCentroid
+
+
+class CentroidTable:
+    """One generation of the index: filenames and their L2-normalised rows."""
+
+    def __init__(self, filenames: List[str], rows: np.ndarray):
+        self.filenames = filenames
+        self.positions: Dict[str, int] = {name: i for i, name in enumerate(filenames)}
+        # Row storage grows by doubling; only the first len(filenames) rows are live
+        self.rows = rows
+
+    @classmethod
+    def build(cls, filenames: List[str], embeddings: list, dimension: int) -> "CentroidTable":
+        """CPU-bound (stack + normalise); run it off the event loop."""
+        if not embeddings:
+            return cls(filenames, np.zeros((0, dimension), dtype=np.float32))
+        return cls(filenames, _normalize(np.stack(embeddings).astype(np.float32, copy=False)))
+
+    def upsert(self, filename: str, vector: np.ndarray) -> None:
+        position = self.positions.get(filename)
+        if position is None:
+            position = len(self.filenames)
+            if position == len(self.rows):
+                grown = np.zeros((max(16, 2 * len(self.rows)), self.rows.shape[1]), dtype=np.float32)
+                grown[:position] = self.rows
+                self.rows = grown
+            self.positions[filename] = position
+            self.filenames.append(filename)
+        self.rows[position] = vector
+
+
+class CentroidIndex:
+    def __init__(self, dimension: int, refresh_seconds: float):
+        self.dimension = dimension
+        self.refresh_seconds = refresh_seconds
+        self._table = CentroidTable([], np.zeros((0, dimension), dtype=np.float32))
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh: Optional[asyncio.Task] = None
+        # Upserts made while a reload is in flight, replayed onto the new table
+        self._pending: Optional[Dict[str, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._table.filenames)
+
+    @property
+    def filenames(self) -> List[str]:
+        return self._table.filenames
+
+    @property
+    def matrix(self) -> np.ndarray:
+        table = self._table
+        return table.rows[:len(table.filenames)]
+
+    async def ensure_fresh(self, session: AsyncSession) -> None:
+        """
+        Loads from Postgres on first use; afterwards, starts a background reload
+        once the table is older than refresh_seconds and returns immediately.
+        """
+        if not self._loaded_at:
+            async with self._lock:
+                # Another request may have loaded while we waited
+                if not self._loaded_at:
+                    await self.load(session)
+            return
+        if time.monotonic() - self._loaded_at >= self.refresh_seconds and self._refresh is None:
+            self._refresh = asyncio.create_task(self._reload())
+
+    async def _reload(self) -> None:
+        # The request that triggered us may close its session before we finish
+        try:
+            async with AsyncSessionLocal() as session:
+                await self.load(session)
+        except Exception as e:
+            print(f"WARNING: Centroid index refresh failed, serving the previous table: {e}")
+            self._loaded_at = time.monotonic()  # Retry after another interval, not on every search
+        finally:
+            self._refresh = None
+
+    async def load(self, session: AsyncSession) -> None:
+        self._pending = {}
+        try:
+            result = await session.execute(select(DocumentCentroid.filename, DocumentCentroid.embedding))
+            rows = result.all()
+            table = await asyncio.to_thread(
+                CentroidTable.build, [row.filename for row in rows], [row.embedding for row in rows], self.dimension
+            )
+            for filename, vector in self._pending.items():
+                table.upsert(filename, vector)
+            self._table = table
+            self._loaded_at = time.monotonic()
+        finally:
+            self._pending = None
+
+    def upsert(self, filename: str, centroid) -> None:
+        """Applies a local write without waiting for the next reload."""
+        if not self._loaded_at:
+            return  # Never searched in this process; the first load will include it
+        vector = _normalize(np.asarray(centroid, dtype=np.float32)[None, :])[0]
+        self._table.upsert(filename, vector)
+        if self._pending is not None:
+            self._pending[filename] = vector
+
+    def top_documents(self, query_embedding, m: int) -> List[str]:
+        """Filenames of the `m` centroids closest to the query (cosine)."""
+        table = self._table
+        if not table.filenames:
+            return []
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32)[None, :])[0]
+        scores = table.rows[:len(table.filenames)] @ query
+        if m >= len(scores):
+            best = np.argsort(-scores)
+        else:
+            best = np.argpartition(-scores, m)[:m]
+            best = best[np.argsort(-scores[best])]
+        return [table.filenames[i] for i in best]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+centroid_index = CentroidIndex(settings.EMBEDDING_DIMENSION, settings.CENTROID_REFRESH_SECONDS)
@@ -0,0 +1,171 @@
+# File: documind-enterprise/backend/app/services/embeddings.py
+# Purpose: Embedding backend selection. OpenAI (remote) or in-process CPU embedders (ONNX / hashing).
+
+"""
+Embedding Backends
+------------------
+All backends implement LangChain's `Embeddings` interface, so the rest of the
+app only ever calls `aembed_query` / `aembed_documents`.
+
+- openai:  OpenAIEmbeddings (network round trip per call).
+- onnx:    A local transformer exported to ONNX (e.g. all-MiniLM-L6-v2).
+           Needs the optional `onnx` extra (onnxruntime + tokenizers).
+- hashing: Dependency-free feature hashing of word uni/bi-grams.
+           Lexical rather than semantic, but works fully air-gapped.
+
+Local backends batch their input and run it in a thread pool, so the event
+loop never blocks (onnxruntime also releases the GIL, so batches overlap).
+
+Selected by settings.EMBEDDING_BACKEND; the vector column dimension
+follows settings.EMBEDDING_DIMENSION.
+"""
+
+import asyncio
+import re
+import zlib
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+from app.core.config import settings
+
+
+class LocalEmbeddings(Embeddings):
+    """Base class for in-process CPU embedders: batching + thread pool."""
+
+    def __init__(self, dimension: int, batch_size: int = 32, threads: int = 4):
+        self.dimension = dimension
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="embed")
+
+    @abstractmethod
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Returns an (len(texts), dimension) float32 array of L2-normalised rows."""
+
+    def _batches(self, texts: List[str]):
+        for lo in range(0, len(texts), self.batch_size):
+            yield texts[lo:lo + self.batch_size]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [row.tolist() for batch in self._batches(texts) for row in self._embed_batch(batch)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_batch([text])[0].tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        arrays = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, self._embed_batch, batch) for batch in self._batches(texts)
+        ))
+        return [row.tolist() for array in arrays for row in array]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        array = await loop.run_in_executor(self._executor, self._embed_batch, [text])
+        return array[0].tolist()
+
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class HashingEmbeddings(LocalEmbeddings):
+    """
+    Signed feature hashing (the "hashing trick") over word unigrams and bigrams,
+    log-scaled term frequencies, L2-normalised. crc32 keeps buckets stable across
+    processes (Python's hash() is salted per process).
+    """
+
+    _TOKEN = re.compile(r"\w+")
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = self._TOKEN.findall(text.casefold())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                h = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, h % self.dimension] += 1.0 if h & 0x80000000 else -1.0
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return _l2_normalize(vectors)
+
+
+class OnnxEmbeddings(LocalEmbeddings):
+    """
+    Sentence-transformer style encoder exported to ONNX.
+
+    `model_path` is a directory containing `model.onnx` and the HuggingFace
+    `tokenizer.json`. Token embeddings are mean-pooled over the attention mask.
+    """
+
+    def __init__(self, model_path: str, dimension: int, batch_size: int = 32, threads: int = 4, max_length: int = 512):
+        super().__init__(dimension, batch_size, threads)
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise RuntimeError(
+                "EMBEDDING_BACKEND=onnx needs the optional 'onnx' extra: poetry install -E onnx"
+            ) from e
+
+        model_dir = Path(model_path)
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        options = onnxruntime.SessionOptions()
+        # Parallelism comes from the thread pool; keep each run single-threaded
+        options.intra_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            str(model_dir / "model.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        # Fail at startup, not at the first INSERT, if the model and column disagree
+        produced = self._embed_batch(["dimension probe"]).shape[1]
+        if produced != dimension:
+            raise RuntimeError(f"ONNX model produces {produced}-dim vectors; set EMBEDDING_DIM={produced}.")
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return _l2_normalize(pooled.astype(np.float32))
+
+
+def build_embedding_model(backend: str) -> Embeddings:
+    """Instantiates the embedding backend called `backend`."""
+    dimension = settings.embedding_dimension_for(backend)
+    if backend == "openai":
+        return OpenAIEmbeddings(
+            model=settings.EMBEDDING_MODEL,
+            openai_api_key=settings.OPENAI_API_KEY,
+            dimensions=settings.EMBEDDING_DIM
+        )
+    if backend == "onnx":
+        if not settings.ONNX_MODEL_PATH:
+            raise RuntimeError("EMBEDDING_BACKEND=onnx requires ONNX_MODEL_PATH.")
+        return OnnxEmbeddings(
+            settings.ONNX_MODEL_PATH, dimension, settings.EMBEDDING_BATCH_SIZE, settings.EMBEDDING_THREADS
+        )
+    if backend == "hashing":
+        return HashingEmbeddings(dimension, settings.EMBEDDING_BATCH_SIZE, settings.EMBEDDING_THREADS)
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {backend}")
+
+
+@lru_cache
+def get_embedding_model() -> Embeddings:
+    """The configured backend, shared per process (reuses HTTP pools / ONNX sessions)."""
+    return build_embedding_model(settings.EMBEDDING_BACKEND)
@@ -41,27 +41,31 @@ class IngestionService:
         filename = file.filename
         
         # 1. Extract Text based on file type
-        text_content = ""
-        
-        if filename.endswith(".pdf"):
-            text_content = self._parse_pdf(content)
-        elif filename.endswith(".txt") or filename.endswith(".md"):
-            text_content = content.decode("utf-8")
-        else:
+        try:
+            text_content = parse_file_bytes(filename, content)
+        except UnsupportedFileError:
             raise HTTPException(status_code=400, detail="Unsupported file format. Use PDF or TXT.")
+        except PdfParseError:
+            raise HTTPException(status_code=500, detail="Failed to parse PDF file.")
 
         if not text_content.strip():
             raise HTTPException(status_code=400, detail="File content is empty or unreadable.")
 
-        # 2. Create a base document
+        # 2. Split into chunks
+        return self.split_text(text_content, source=filename)
+
+    def split_text(self, text_content: str, source: str) -> List[Document]:
+        """
+        Splits raw text into indexed chunks.
+        Shared by the upload endpoint and the bulk-ingest CLI.
+        """
         # We wrap the raw text in a Document object to pass to the splitter
         # Metadata is crucial for citations later
         raw_doc = Document(
             page_content=text_content,
-            metadata={"source": filename}
+            metadata={"source": source}
         )
 
-        # 3. Split into chunks
         chunks = self.text_splitter.split_documents([raw_doc])
         
         # Add index metadata for ordering
@@ -70,14 +74,45 @@ class IngestionService:
             
         return chunks
 
-    def _parse_pdf(self, file_bytes: bytes) -> str:
-        """Helper to extract text from PDF bytes."""
-        try:
-            pdf_reader = PdfReader(io.BytesIO(file_bytes))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            print(f"Error parsing PDF: {e}")
-            raise HTTPException(status_code=500, detail="Failed to parse PDF file.")
\ No newline at end of file
+
+# --- Parsing Helpers ---
+# Kept at module level (and free of FastAPI types) so they can be pickled
+# into a ProcessPoolExecutor by the bulk-ingest pipeline.
+
+class UnsupportedFileError(ValueError):
+    """Raised when the file extension has no parser."""
+
+
+class PdfParseError(ValueError):
+    """Raised when pypdf cannot read the file."""
+
+
+SUPPORTED_EXTENSIONS = (".pdf", ".txt", ".md")
+
+
+def parse_file_bytes(filename: str, content: bytes) -> str:
+    """
+    Extracts text from raw file bytes based on the file extension.
+    
+    Raises:
+        UnsupportedFileError: Extension is not PDF/TXT/MD.
+        PdfParseError: PDF could not be parsed.
+    """
+    if filename.endswith(".pdf"):
+        return _parse_pdf(content)
+    elif filename.endswith(".txt") or filename.endswith(".md"):
+        return content.decode("utf-8")
+    raise UnsupportedFileError(filename)
+
+
+def _parse_pdf(file_bytes: bytes) -> str:
+    """Helper to extract text from PDF bytes."""
+    try:
+        pdf_reader = PdfReader(io.BytesIO(file_bytes))
+        text = ""
+        for page in pdf_reader.pages:
+            text += page.extract_text() + "\n"
+        return text
+    except Exception as e:
+        print(f"Error parsing PDF: {e}")
+        raise PdfParseError(str(e)) from e
@@ -11,11 +11,12 @@ Orchestrates the RAG flow:
 """
 
 from typing import TypedDict, List
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langgraph.graph import StateGraph, END
 from app.services.vector_store import VectorStoreService
+from app.services.admission import admission, Priority
+from app.services.resilient_llm import get_resilient_llm
 
 # --- State Definition ---
 class AgentState(TypedDict):
@@ -27,11 +28,11 @@ class AgentState(TypedDict):
 class RAGAgent:
     def __init__(self, vector_store: VectorStoreService):
         self.vector_store = vector_store
-        # Temperature 0 ensures deterministic output (crucial for routing)
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        # Shared client: per-node deadlines, hedging & fallback (see resilient_llm)
+        self.llm = get_resilient_llm()
 
-    async def run(self, question: str):
-        """Builds and runs the LangGraph state machine."""
+    def _build_graph(self):
+        """Builds and compiles the LangGraph state machine."""
         
         # 1. Define Workflow
         workflow = StateGraph(AgentState)
@@ -58,13 +59,25 @@ class RAGAgent:
         workflow.add_edge("generate_rag", END)
         workflow.add_edge("generate_general", END)
 
-        # 4. Compile & Run
-        app = workflow.compile()
+        # 4. Compile
+        return workflow.compile()
+
+    async def run(self, question: str):
+        """Runs the graph to completion and returns the final state."""
+        app = self._build_graph()
         inputs = {"question": question, "documents": [], "intent": "", "answer": ""}
         
         result = await app.ainvoke(inputs)
         return result
 
+    async def stream(self, question: str):
+        """Yields the full state after every node; the last item equals `run()`'s result."""
+        app = self._build_graph()
+        inputs = {"question": question, "documents": [], "intent": "", "answer": ""}
+
+        async for state in app.astream(inputs, stream_mode="values"):
+            yield state
+
     # --- Node Logic ---
 
     async def router_node(self, state: AgentState):
@@ -81,8 +94,9 @@ class RAGAgent:
             Query: {question}
             """
         )
-        chain = prompt | self.llm | StrOutputParser()
-        intent = await chain.ainvoke({"question": state["question"]})
+        chain = prompt | self.llm.for_node("router") | StrOutputParser()
+        async with admission.llm.slot(Priority.INTERACTIVE):
+            intent = await chain.ainvoke({"question": state["question"]})
         
         # --- FIX: Strict Cleaning Logic ---
         # Even if LLM says "Result: General", we extract just the keyword.
@@ -103,12 +117,13 @@ class RAGAgent:
         results = await self.vector_store.search(state["question"])
         
         docs = []
-        for chunk, score in results:
+        for row in results:
             docs.append({
-                "content": chunk.content,
-                "source": chunk.filename,
-                "page": chunk.doc_metadata.get("page", 1),
-                "score": score
+                "content": row.content,
+                "source": row.filename,
+                "page": row.page,
+                # Cosine distance is in [0, 2]; report similarity instead
+                "score": round(1.0 - row.distance, 4)
             })
         return {"documents": docs}
 
@@ -127,13 +142,15 @@ class RAGAgent:
             Question: {question}
             """
         )
-        chain = prompt | self.llm | StrOutputParser()
-        answer = await chain.ainvoke({"context": context, "question": state["question"]})
+        chain = prompt | self.llm.for_node("generate") | StrOutputParser()
+        async with admission.llm.slot(Priority.INTERACTIVE):
+            answer = await chain.ainvoke({"context": context, "question": state["question"]})
         return {"answer": answer}
 
     async def generate_general_node(self, state: AgentState):
         """Handles casual chat."""
         prompt = ChatPromptTemplate.from_template("You are a helpful assistant. Respond kindly to: {question}")
-        chain = prompt | self.llm | StrOutputParser()
-        answer = await chain.ainvoke({"question": state["question"]})
+        chain = prompt | self.llm.for_node("generate") | StrOutputParser()
+        async with admission.llm.slot(Priority.INTERACTIVE):
+            answer = await chain.ainvoke({"question": state["question"]})
         return {"answer": answer}
\ No newline at end of file
@@ -0,0 +1,277 @@
+# File: documind-enterprise/backend/app/services/query_cache.py
+# Purpose: Two-level cache for query embeddings (per-worker LRU + optional store shared by all workers).
+
+"""
+Query Embedding Cache
+---------------------
+Popular questions (FAQ buttons) are embedded once instead of once per request:
+1. L1: bounded in-process LRU of float32 arrays (per uvicorn worker).
+2. L2: optional shared tier, so one worker's miss warms every other worker:
+   - mmap:  fixed-size table in a memory-mapped file on the host (no extra service).
+   - redis: any Redis-protocol server (needs the optional `redis` extra).
+
+Keys are a digest of the embedding model id plus the normalised question, so
+"What is X?" and "what is x" share an entry, and switching models never
+serves vectors from the old space. Concurrent misses for the same key are
+coalesced (one provider call).
+
+Reported at /metrics: query_cache_{l1,l2}_hits_total, query_cache_misses_total,
+query_cache_hit_ratio and query_cache_saved_seconds_total (hits x mean miss latency).
+"""
+
+import fcntl
+import hashlib
+import os
+import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.query_text import normalize_query
+from app.services.single_flight import SingleFlight
+
+
+class LRUVectorCache:
+    """L1: the most recently used `max_entries` vectors, as read-only float32 arrays."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+        return vector
+
+    def put(self, key: bytes, vector: np.ndarray) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class MmapVectorStore:
+    """
+    L2 shared through a memory-mapped file: every worker on the host maps the
+    same table, so entries written by one are read by all. Only opening the
+    file is locked (a sidecar `<path>.lock`); reads and writes are not:
+
+    - Slots are grouped in sets of WAYS; a key lives in one set (by digest)
+      and a full set overwrites a slot picked by the digest.
+    - Each slot stores a crc32 over key + vector. A read racing a write (or two
+      workers writing the same slot) fails the check and counts as a miss.
+
+    Layout: 32-byte header, then `slots` x (digest 16B | crc32 4B | float32 x dimension).
+    """
+
+    WAYS = 4
+    MAGIC = b"DMQCACHE"
+    VERSION = 1
+    HEADER_SIZE = 32
+    _EMPTY = bytes(16)
+
+    def __init__(self, path: str, dimension: int, slots: int):
+        self.path = Path(path)
+        self.dimension = dimension
+        self.slots = max(self.WAYS, slots - slots % self.WAYS)
+        self.record = np.dtype([("digest", "V16"), ("check", "<u4"), ("vector", "<f4", (dimension,))])
+
+        header = np.zeros(1, dtype=[("magic", "S8"), ("version", "<u4"), ("dimension", "<u4"), ("slots", "<u4")])
+        header[0] = (self.MAGIC, self.VERSION, dimension, self.slots)
+        table = self._open(header.tobytes().ljust(self.HEADER_SIZE, b"\0"))
+        self._digests = table["digest"]
+        self._checks = table["check"]
+        self._vectors = table["vector"]
+
+    def _open(self, header: bytes) -> np.memmap:
+        # Workers start together: check, (re)create and map under one exclusive lock,
+        # so none can swap the file after another has checked it but before it maps
+        # (that worker would be left on the orphaned inode, sharing nothing)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not self._matches(header):
+                self._create(header)
+            return np.memmap(self.path, dtype=self.record, mode="r+", offset=self.HEADER_SIZE, shape=(self.slots,))
+
+    def _size(self) -> int:
+        return self.HEADER_SIZE + self.slots * self.record.itemsize
+
+    def _matches(self, header: bytes) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                return f.read(self.HEADER_SIZE) == header and os.fstat(f.fileno()).st_size == self._size()
+        except FileNotFoundError:
+            return False
+
+    def _create(self, header: bytes) -> None:
+        # Missing or laid out for another dimension/size: build a fresh (sparse)
+        # file aside and swap it in, so no worker ever maps a half-written header
+        size = self._size()
+        print(f"INFO:    Creating query embedding cache {self.path} ({size / 2**20:.0f} MiB max)")
+        scratch = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(scratch, "wb") as f:
+            f.write(header)
+            f.truncate(size)
+        os.replace(scratch, self.path)
+
+    def _set(self, key: bytes) -> int:
+        return int.from_bytes(key[:8], "little") % (self.slots // self.WAYS) * self.WAYS
+
+    def _check(self, key: bytes, vector: np.ndarray) -> int:
+        return zlib.crc32(vector.tobytes(), zlib.crc32(key))
+
+    async def get(self, key: bytes) -> Optional[np.ndarray]:
+        base = self._set(key)
+        for slot in range(base, base + self.WAYS):
+            if self._digests[slot].tobytes() == key:
+                vector = np.array(self._vectors[slot])
+                if self._check(key, vector) == int(self._checks[slot]):
+                    return vector
+                return None
+        return None
+
+    async def put(self, key: bytes, vector: np.ndarray) -> None:
+        base = self._set(key)
+        digests = [self._digests[slot].tobytes() for slot in range(base, base + self.WAYS)]
+        if key in digests:
+            slot = base + digests.index(key)
+        elif self._EMPTY in digests:
+            slot = base + digests.index(self._EMPTY)
+        else:
+            slot = base + key[8] % self.WAYS
+
+        # Hide the slot while it is rewritten, publish the digest last
+        self._digests[slot] = np.void(self._EMPTY)
+        self._vectors[slot] = vector
+        self._checks[slot] = self._check(key, np.asarray(vector, dtype="<f4"))
+        self._digests[slot] = np.void(key)
+
+
+class RedisVectorStore:
+    """L2 in Redis: raw little-endian float32 bytes under `prefix + hex(key)`, with a TTL."""
+
+    def __init__(self, client, dimension: int, ttl_seconds: int, prefix: str = "documind:qemb:"):
+        self.client = client
+        self.dimension = dimension
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, dimension: int, ttl_seconds: int) -> "RedisVectorStore":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError(
+                "QUERY_CACHE_SHARED=redis needs the optional 'redis' extra: poetry install -E redis"
+            ) from e
+        return cls(Redis.from_url(url), dimension, ttl_seconds)
+
+    async def get(self, key: bytes) -> Optional[np.ndarray]:
+        raw = await self.client.get(self.prefix + key.hex())
+        if raw is None or len(raw) != self.dimension * 4:
+            return None
+        return np.frombuffer(raw, dtype="<f4").copy()
+
+    async def put(self, key: bytes, vector: np.ndarray) -> None:
+        await self.client.set(self.prefix + key.hex(), vector.astype("<f4").tobytes(), ex=self.ttl_seconds)
+
+
+class QueryEmbeddingCache:
+    """
+    Args:
+        model_id: Embedding model identity (settings.EMBEDDING_MODEL_ID); part of every key.
+        max_entries: L1 capacity.
+        shared: Optional L2 (MmapVectorStore / RedisVectorStore). Its failures are
+                logged and treated as misses; they never fail a search.
+    """
+
+    def __init__(self, model_id: str, max_entries: int, shared=None):
+        self.model_id = model_id
+        self.local = LRUVectorCache(max_entries)
+        self.shared = shared
+        self._flights = SingleFlight("query_cache")
+
+    def key(self, query: str) -> bytes:
+        # The first spelling to miss provides the vector for all its variants
+        return hashlib.blake2b(f"{self.model_id}\0{normalize_query(query)}".encode("utf-8"), digest_size=16).digest()
+
+    async def get_or_embed(self, query: str, embed: Callable[[], Awaitable[List[float]]]) -> np.ndarray:
+        """Cached embedding of `query`; calls `embed()` only on a miss at both levels."""
+        key = self.key(query)
+
+        vector = self.local.get(key)
+        if vector is not None:
+            self._hit("l1")
+            return vector
+
+        if self.shared is not None:
+            try:
+                vector = await self.shared.get(key)
+            except Exception as e:
+                print(f"WARNING: Shared query cache read failed: {e}")
+            if vector is not None:
+                vector.flags.writeable = False
+                self.local.put(key, vector)
+                self._hit("l2")
+                return vector
+
+        metrics.counter("query_cache_misses_total").inc()
+        self._update_ratio()
+        return await self._flights.do(key.hex(), lambda: self._fill(key, embed))
+
+    async def _fill(self, key: bytes, embed: Callable[[], Awaitable[List[float]]]) -> np.ndarray:
+        started = time.perf_counter()
+        vector = np.asarray(await embed(), dtype=np.float32)
+        metrics.histogram("query_cache_miss_seconds").observe(time.perf_counter() - started)
+
+        vector.flags.writeable = False  # Shared by every later hit
+        self.local.put(key, vector)
+        if self.shared is not None:
+            try:
+                await self.shared.put(key, vector)
+            except Exception as e:
+                print(f"WARNING: Shared query cache write failed: {e}")
+        return vector
+
+    def _hit(self, level: str) -> None:
+        metrics.counter(f"query_cache_{level}_hits_total").inc()
+        # Estimated: what this hit would have cost as a provider call
+        metrics.counter("query_cache_saved_seconds_total").inc(metrics.histogram("query_cache_miss_seconds").mean)
+        self._update_ratio()
+
+    def _update_ratio(self) -> None:
+        hits = metrics.counter("query_cache_l1_hits_total").value + metrics.counter("query_cache_l2_hits_total").value
+        total = hits + metrics.counter("query_cache_misses_total").value
+        metrics.gauge("query_cache_hit_ratio").set(hits / total if total else 0.0)
+
+
+def build_shared_store(kind: str):
+    """Instantiates the L2 tier called `kind` ("none" returns None)."""
+    if kind == "none":
+        return None
+    if kind == "mmap":
+        return MmapVectorStore(settings.QUERY_CACHE_MMAP_PATH, settings.EMBEDDING_DIMENSION, settings.QUERY_CACHE_MMAP_SLOTS)
+    if kind == "redis":
+        return RedisVectorStore.from_url(
+            settings.QUERY_CACHE_REDIS_URL, settings.EMBEDDING_DIMENSION, settings.QUERY_CACHE_TTL_SECONDS
+        )
+    raise ValueError(f"Unknown QUERY_CACHE_SHARED: {kind}")
+
+
+@lru_cache
+def get_query_cache() -> Optional[QueryEmbeddingCache]:
+    """The per-process cache, or None when QUERY_CACHE_ENABLED is off."""
+    if not settings.QUERY_CACHE_ENABLED:
+        return None
+    return QueryEmbeddingCache(
+        settings.EMBEDDING_MODEL_ID, settings.QUERY_CACHE_ENTRIES, build_shared_store(settings.QUERY_CACHE_SHARED)
+    )
@@ -0,0 +1,91 @@
+# File: documind-enterprise/backend/app/services/query_text.py
+# Purpose: Shared helpers for treating user questions as cache / dedup keys.
+
+"""
+Query Text Helpers
+------------------
+1. Canonicalises user questions so trivially different spellings
+   ("What is X?" vs "  what is x ") map to the same key.
+2. Builds query-aware citation snippets from retrieved chunks.
+"""
+
+import re
+import unicodedata
+from typing import List, Set, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = "?!.,;: "
+_TOKEN = re.compile(r"\w+")
+
+# Too common to anchor a snippet on
+_STOPWORDS = {
+    "the", "and", "for", "are", "was", "were", "what", "who", "how", "why", "when",
+    "where", "which", "does", "did", "can", "about", "with", "this", "that", "from",
+    "have", "has", "you", "your", "our", "their", "there", "into", "tell",
+}
+
+
+def normalize_query(text: str) -> str:
+    """Unicode-normalise, case-fold, collapse whitespace and drop trailing punctuation."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return text.rstrip(_TRAILING_PUNCTUATION)
+
+
+def query_terms(query: str) -> Set[str]:
+    """Distinct, case-folded content words of a query."""
+    return {
+        token for token in _TOKEN.findall(normalize_query(query))
+        if len(token) > 2 and token not in _STOPWORDS
+    }
+
+
+def make_snippet(content: str, query: str, width: int = 160) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Picks the `width`-character window of `content` covering the most distinct
+    query terms (falls back to the opening of the chunk).
+
+    Returns:
+        (snippet, highlights): highlights are (start, end) offsets of
+        query-term matches inside the returned snippet.
+    """
+    text = _WHITESPACE.sub(" ", content).strip()
+    terms = query_terms(query)
+    hits = [(m.start(), m.group().casefold()) for m in _TOKEN.finditer(text) if m.group().casefold() in terms]
+
+    # Two-pointer sweep: best window anchored at a term hit
+    start, best, counts, lo = 0, 0, {}, 0
+    for pos, term in hits:
+        counts[term] = counts.get(term, 0) + 1
+        while pos - hits[lo][0] >= width:
+            old = hits[lo][1]
+            counts[old] -= 1
+            if not counts[old]:
+                del counts[old]
+            lo += 1
+        if len(counts) > best:
+            best, start = len(counts), hits[lo][0]
+
+    # Give the first hit some leading context, then snap to word boundaries.
+    # The snap only looks back another lead-in: a long unbroken token (URL,
+    # glued PDF words) must not drag the window away from the hit
+    if start:
+        start = max(0, start - width // 4)
+        space = text.rfind(" ", max(0, start - width // 4), start + 1)
+        if space >= 0:
+            start = space + 1
+    end = min(len(text), start + width)
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > start else end
+
+    snippet = text[start:end].strip()
+    prefix = "..." if start > 0 else ""
+    suffix = "..." if end < len(text) else ""
+    snippet = prefix + snippet + suffix
+
+    highlights = [
+        (m.start(), m.end()) for m in _TOKEN.finditer(snippet)
+        if m.group().casefold() in terms
+    ]
+    return snippet, highlights
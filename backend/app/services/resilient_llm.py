@@ -0,0 +1,192 @@
+# File: documind-enterprise/backend/app/services/resilient_llm.py
+# Purpose: Tail-latency control for chat completions: per-node deadlines, hedged requests, model fallback.
+
+"""
+Resilient LLM Client
+--------------------
+Wraps a primary and a secondary chat model (a different model, region or endpoint):
+1. Deadline: each graph node has a hard timeout (asyncio.TimeoutError past it).
+2. Hedging:  if the primary has not answered within the p95 of its own past
+             latencies on this node, the same prompt goes to the secondary.
+             The first answer wins and the other request is cancelled.
+3. Fallback: if the primary fails outright, the secondary is tried at once.
+
+Hedges are paid for from a token bucket (each request earns `hedge_max_ratio`
+tokens, each hedge costs one), so at most ~10% extra load even when the
+provider is slow across the board. A hedge also needs its own admission
+slot, taken without queueing: when none is free the hedge is skipped, so
+provider concurrency never exceeds LLM_MAX_CONCURRENCY. (Fallback reuses
+the failed primary's slot.)
+
+Usage (in a LangChain pipe):
+    chain = prompt | llm.for_node("router") | StrOutputParser()
+"""
+
+import asyncio
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_openai import ChatOpenAI
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.admission import ConcurrencyBudget, admission
+
+
+class HedgedChatModel:
+    """
+    Args:
+        primary: Model tried first.
+        secondary: Model used for hedges and fallback (None disables both).
+        node_timeouts: Hard deadline per node name, in seconds.
+        default_timeout: Deadline for nodes not listed.
+        hedge_max_ratio: Long-run cap on hedges per request.
+        initial_hedge_delay: Hedge delay used until `min_samples` latencies are known.
+        min_samples: Observations required before trusting the node's p95.
+        budget: Admission budget a hedge must get a free slot from (None: unbounded).
+    """
+
+    MAX_HEDGE_TOKENS = 10.0
+
+    def __init__(
+        self,
+        primary: BaseChatModel,
+        secondary: Optional[BaseChatModel] = None,
+        node_timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: float = 60.0,
+        hedge_max_ratio: float = 0.1,
+        initial_hedge_delay: float = 2.0,
+        min_samples: int = 20,
+        budget: Optional[ConcurrencyBudget] = None
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.node_timeouts = node_timeouts or {}
+        self.default_timeout = default_timeout
+        self.hedge_max_ratio = hedge_max_ratio
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_samples = min_samples
+        self.budget = budget
+        self._hedge_tokens = 1.0
+
+    def for_node(self, node: str) -> Runnable:
+        """A Runnable bound to `node`'s deadline and latency statistics."""
+        async def invoke(prompt):
+            return await self.ainvoke(prompt, node)
+        return RunnableLambda(invoke, name=f"hedged_llm_{node}")
+
+    async def ainvoke(self, prompt, node: str):
+        metrics.counter("llm_requests_total").inc()
+        self._hedge_tokens = min(self.MAX_HEDGE_TOKENS, self._hedge_tokens + self.hedge_max_ratio)
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                self._race(prompt, node), timeout=self.node_timeouts.get(node, self.default_timeout)
+            )
+        except asyncio.TimeoutError:
+            metrics.counter(f"llm_{node}_timeouts_total").inc()
+            raise
+        metrics.histogram(f"llm_{node}_latency_seconds").observe(time.perf_counter() - started)
+        return result
+
+    def hedge_delay(self, node: str) -> float:
+        # The primary's own latency: the end-to-end histogram is already cut short by hedging
+        latency = metrics.histogram(f"llm_{node}_primary_latency_seconds")
+        if latency.count < self.min_samples:
+            return self.initial_hedge_delay
+        return latency.quantile(0.95)
+
+    async def _race(self, prompt, node: str):
+        started = time.perf_counter()
+        primary = asyncio.create_task(self.primary.ainvoke(prompt))
+        primary.add_done_callback(lambda task: self._observe_primary(node, started, task))
+        pending = {primary}
+        secondary = None
+        hedge_at = time.perf_counter() + self.hedge_delay(node)
+        may_hedge = self.secondary is not None
+        last_error = None
+
+        try:
+            while True:
+                waiting_to_hedge = may_hedge and secondary is None
+                timeout = max(0.0, hedge_at - time.perf_counter()) if waiting_to_hedge else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary:
+                            metrics.counter("llm_hedge_wins_total").inc()
+                        return task.result()
+                    last_error = task.exception()
+                    print(f"WARNING: LLM call failed on node '{node}': {last_error}")
+
+                if secondary is None and self.secondary is not None:
+                    if primary in done:
+                        # Primary failed: fall back immediately (not a hedge, no budget)
+                        metrics.counter("llm_fallbacks_total").inc()
+                        secondary = asyncio.create_task(self.secondary.ainvoke(prompt))
+                    elif waiting_to_hedge and self._hedge_tokens < 1.0:
+                        metrics.counter("llm_hedge_budget_exhausted_total").inc()
+                        may_hedge = False
+                    elif waiting_to_hedge and self.budget is not None and not self.budget.try_acquire():
+                        metrics.counter("llm_hedge_no_slot_total").inc()
+                        may_hedge = False
+                    elif waiting_to_hedge:
+                        # Primary is slower than p95: race a second request
+                        self._hedge_tokens -= 1.0
+                        metrics.counter("llm_hedges_total").inc()
+                        secondary = asyncio.create_task(self.secondary.ainvoke(prompt))
+                        if self.budget is not None:
+                            secondary.add_done_callback(lambda _: self.budget.release())
+                    if secondary is not None:
+                        pending.add(secondary)
+
+                if not pending:
+                    raise last_error
+        finally:
+            # Cancel the loser (or everything, if our own deadline fired)
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _observe_primary(node: str, started: float, task: asyncio.Task) -> None:
+        # Only completed answers; a cancelled loser has no latency to report
+        if not task.cancelled() and task.exception() is None:
+            metrics.histogram(f"llm_{node}_primary_latency_seconds").observe(time.perf_counter() - started)
+
+
+@lru_cache
+def get_resilient_llm() -> HedgedChatModel:
+    """Process-wide instance, so latency statistics and the hedge budget are shared."""
+    # Temperature 0 ensures deterministic output (crucial for routing)
+    # Retries are handled by the fallback path instead of inside the client
+    primary = ChatOpenAI(
+        model=settings.LLM_MODEL,
+        temperature=0,
+        max_retries=0,
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.LLM_BASE_URL
+    )
+    secondary = None
+    if settings.LLM_HEDGE_ENABLED:
+        secondary = ChatOpenAI(
+            model=settings.LLM_HEDGE_MODEL or settings.LLM_MODEL,
+            temperature=0,
+            max_retries=0,
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.LLM_HEDGE_BASE_URL or settings.LLM_BASE_URL
+        )
+    return HedgedChatModel(
+        primary,
+        secondary,
+        node_timeouts={
+            "router": settings.LLM_ROUTER_TIMEOUT_SECONDS,
+            "generate": settings.LLM_GENERATE_TIMEOUT_SECONDS,
+        },
+        default_timeout=settings.LLM_GENERATE_TIMEOUT_SECONDS,
+        hedge_max_ratio=settings.LLM_HEDGE_MAX_RATIO,
+        initial_hedge_delay=settings.LLM_HEDGE_INITIAL_DELAY_SECONDS,
+        budget=admission.llm,
+    )
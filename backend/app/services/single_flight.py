@@ -0,0 +1,140 @@
+# File: documind-enterprise/backend/app/services/single_flight.py
+# Purpose: Request coalescing. Identical concurrent queries share one agent execution.
+
+"""
+Single-Flight Service
+---------------------
+When N requests with the same key arrive while one is already running,
+only the first (the "leader") executes; the others ("followers") attach
+to the in-flight execution and receive the same result or exception.
+
+Flights carry an event log so streaming subscribers can join at any time:
+late joiners replay the events emitted so far, then follow live.
+Completed flights are forgotten immediately (this is not a result cache).
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from app.core.metrics import metrics
+
+
+class Flight:
+    """One in-flight execution and its fan-out state."""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+        self.started = time.perf_counter()
+        self._changed = asyncio.Condition()
+
+    async def publish(self, event: Any) -> None:
+        async with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+
+    async def finish(self, error: Optional[BaseException] = None) -> None:
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    @property
+    def result(self) -> Any:
+        """The final event is the flight's result."""
+        return self.events[-1] if self.events else None
+
+    async def follow(self) -> AsyncIterator[Any]:
+        """Replays past events, then yields new ones until the flight ends."""
+        seen = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.events) > seen or self.done)
+                batch = self.events[seen:]
+                finished = self.done
+            for event in batch:
+                yield event
+            seen += len(batch)
+            if finished and seen == len(self.events):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent work by key.
+
+    Args:
+        name: Metric prefix, e.g. "chat" -> chat_singleflight_followers_total.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[str, Flight] = {}
+        self._tasks = set()
+
+    async def do(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Returns the result of `factory()` for `key`, executing it at most once
+        across all concurrent callers.
+
+        `factory` returns either an awaitable (its value is the result) or an
+        async iterator (every item is an event; the last one is the result).
+        """
+        flight = self._join(key, factory)
+        async for _ in flight.follow():
+            pass
+        return flight.result
+
+    def in_flight(self, key: str) -> bool:
+        """True if a call for `key` would join a running flight instead of starting one."""
+        return key in self._flights
+
+    def subscribe(self, key: str, factory: Callable[[], Any]) -> AsyncIterator[Any]:
+        """Streaming variant of `do`: yields every event of the shared flight."""
+        return self._join(key, factory).follow()
+
+    def _join(self, key: str, factory: Callable[[], Any]) -> Flight:
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.followers += 1
+            metrics.counter(f"{self.name}_singleflight_followers_total").inc()
+            return flight
+
+        flight = Flight()
+        self._flights[key] = flight
+        metrics.counter(f"{self.name}_singleflight_leaders_total").inc()
+        metrics.gauge(f"{self.name}_singleflight_inflight").inc()
+
+        # The leader runs as its own task so a disconnecting caller
+        # does not cancel the work its followers are waiting on.
+        task = asyncio.create_task(self._drive(key, flight, factory))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return flight
+
+    async def _drive(self, key: str, flight: Flight, factory: Callable[[], Any]) -> None:
+        error = None
+        try:
+            produced = factory()
+            if hasattr(produced, "__aiter__"):
+                async for event in produced:
+                    await flight.publish(event)
+            else:
+                await flight.publish(await produced)
+        except BaseException as e:
+            error = e
+        finally:
+            # Forget the flight first so callers arriving from now on start fresh
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            metrics.gauge(f"{self.name}_singleflight_inflight").dec()
+            if flight.followers:
+                elapsed = time.perf_counter() - flight.started
+                metrics.counter(f"{self.name}_singleflight_saved_seconds_total").inc(elapsed * flight.followers)
+            await flight.finish(error)
+        if isinstance(error, asyncio.CancelledError):
+            raise error
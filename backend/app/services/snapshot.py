@@ -0,0 +1,508 @@
+# File: documind-enterprise/backend/app/services/snapshot.py
+# Purpose: Compact binary export/import of document chunks + embeddings (environment bootstrap without re-embedding).
+
+"""
+Snapshot Service
+----------------
+A snapshot is a directory of flat, little-endian column files plus a manifest:
+
+    manifest.json           rows, dimension, embedding model id, file layout
+    embeddings.f32          float32 [rows, dimension], row-major (np.memmap-able)
+    ids.uuid                16 raw bytes per row
+    chunk_index.i32         int32 [rows]
+    created_at.i64          int64 microseconds since the Unix epoch (datetime64[us])
+    filename_code.i32       int32 [rows] -> index into the `filenames` string column
+    <column>.bin + .off     UTF-8 strings: concatenated bytes + int64 [n + 1] offsets
+                            (filenames, content, metadata; SQL NULL metadata is "")
+
+Vectors never go through text: export streams them out of Postgres with
+binary COPY and decodes whole buffers at once with numpy; import sends them
+back through binary COPY. Both directions run on a dedicated asyncpg
+connection (custom codecs must not leak into the SQLAlchemy pool).
+
+Import drops the secondary indexes of document_chunks, bulk-loads with
+COPY, rebuilds the indexes once and recomputes the document centroids, all
+in one transaction.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import asyncpg
+import numpy as np
+from app.core.config import settings
+from app.core.database import engine
+
+FORMAT = "documind-snapshot"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Column order of every COPY into document_chunks
+COPY_COLUMNS = ("id", "filename", "chunk_index", "content", "doc_metadata", "embedding", "created_at")
+
+# Secondary index built by `--hnsw` when the table has no vector index yet
+HNSW_INDEX = "ix_document_chunks_embedding_hnsw"
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+
+
+class SnapshotError(ValueError):
+    """The snapshot is malformed or does not fit this deployment."""
+
+
+@dataclass
+class SnapshotStats:
+    """Outcome of an export or import, for throughput reporting."""
+    rows: int
+    bytes: int
+    seconds: float
+    index_seconds: float = 0.0
+
+    def line(self) -> str:
+        elapsed = max(self.seconds, 1e-9)
+        text = (
+            f"{self.rows} rows, {self.bytes / 2**20:.1f} MiB in {self.seconds:.1f}s "
+            f"({self.rows / elapsed:,.0f} rows/s, {self.bytes / 2**20 / elapsed:.1f} MiB/s)"
+        )
+        if self.index_seconds:
+            text += f"; index rebuild {self.index_seconds:.1f}s"
+        return text
+
+
+def vector_wire_dtype(dimension: int) -> np.dtype:
+    """pgvector's binary send/recv format: uint16 dim, uint16 unused, big-endian float4s."""
+    return np.dtype([("dim", ">u2"), ("unused", ">u2"), ("values", ">f4", (dimension,))])
+
+
+# --- File Format ---
+
+class _StringColumnWriter:
+    def __init__(self, path: Path, name: str):
+        self.name = name
+        self._data = open(path / f"{name}.bin", "wb")
+        self._offsets_path = path / f"{name}.off"
+        self._offsets: List[np.ndarray] = [np.zeros(1, dtype="<i8")]
+        self._end = 0
+
+    def extend(self, values: List[str]) -> None:
+        encoded = [value.encode("utf-8") for value in values]
+        lengths = np.fromiter((len(b) for b in encoded), dtype="<i8", count=len(encoded))
+        self._offsets.append(self._end + np.cumsum(lengths))
+        self._end += int(lengths.sum())
+        self._data.write(b"".join(encoded))
+
+    def close(self) -> dict:
+        self._data.close()
+        offsets = np.concatenate(self._offsets)
+        offsets.tofile(self._offsets_path)
+        return {"data": f"{self.name}.bin", "offsets": f"{self.name}.off", "count": len(offsets) - 1}
+
+
+class StringColumn:
+    """Read-only view over a memory-mapped string column of `count` values."""
+
+    def __init__(self, path: Path, name: str, count: int):
+        self.offsets = _map(path / f"{name}.off", np.dtype("<i8"), (count + 1,))
+        end = int(self.offsets[-1])
+        if self.offsets[0] != 0 or (np.diff(self.offsets) < 0).any():
+            raise SnapshotError(f"{name}.off holds invalid offsets (corrupt snapshot).")
+        self.data = _map(path / f"{name}.bin", np.dtype(np.uint8), (end,))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def slice(self, lo: int, hi: int) -> List[str]:
+        """Decodes rows [lo, hi) from one contiguous read."""
+        base = self.offsets[lo]
+        blob = bytes(self.data[base:self.offsets[hi]])
+        bounds = (self.offsets[lo:hi + 1] - base).tolist()
+        return [blob[a:b].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+
+
+def _map(path: Path, dtype: np.dtype, shape: Tuple[int, ...]) -> np.ndarray:
+    # Checked up front: a short file would otherwise fail inside np.memmap with a bare ValueError
+    expected = dtype.itemsize * int(np.prod(shape))
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        raise SnapshotError(f"{path.name} is missing from {path.parent}.") from None
+    if size != expected:
+        raise SnapshotError(
+            f"{path.name} is {size} bytes, expected {expected} for shape {list(shape)} (truncated or corrupt snapshot)."
+        )
+    # np.memmap refuses empty files
+    if size == 0:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class SnapshotWriter:
+    """
+    Appends rows to a new snapshot directory.
+
+    Scalar/text columns (`add_rows`) and embeddings (`add_embeddings`) are
+    written independently, in the same row order; `close` checks they agree.
+    """
+
+    def __init__(self, path: Path, dimension: int):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        if (self.path / MANIFEST).exists():
+            raise SnapshotError(f"{self.path} already contains a snapshot.")
+        self.dimension = dimension
+        self.rows = 0
+        self.embedded = 0
+        self._files = {
+            "embeddings": open(self.path / "embeddings.f32", "wb"),
+            "ids": open(self.path / "ids.uuid", "wb"),
+            "chunk_index": open(self.path / "chunk_index.i32", "wb"),
+            "created_at": open(self.path / "created_at.i64", "wb"),
+            "filename_code": open(self.path / "filename_code.i32", "wb"),
+        }
+        self._filenames = _StringColumnWriter(self.path, "filenames")
+        self._content = _StringColumnWriter(self.path, "content")
+        self._metadata = _StringColumnWriter(self.path, "metadata")
+        # Filenames repeat once per chunk: store each one once
+        self._filename_codes: Dict[str, int] = {}
+
+    def add_rows(
+        self,
+        ids: List[bytes],
+        filenames: List[str],
+        chunk_indexes: List[int],
+        contents: List[str],
+        metadata: List[Optional[str]],
+        created_at: List[datetime]
+    ) -> None:
+        codes = []
+        for name in filenames:
+            code = self._filename_codes.get(name)
+            if code is None:
+                code = self._filename_codes[name] = len(self._filename_codes)
+                self._filenames.extend([name])
+            codes.append(code)
+
+        self._files["ids"].write(b"".join(ids))
+        np.asarray(chunk_indexes, dtype="<i4").tofile(self._files["chunk_index"])
+        np.asarray(codes, dtype="<i4").tofile(self._files["filename_code"])
+        micros = [(ts - _EPOCH) // _MICROSECOND if ts is not None else 0 for ts in created_at]
+        np.asarray(micros, dtype="<i8").tofile(self._files["created_at"])
+        self._content.extend(contents)
+        self._metadata.extend([m or "" for m in metadata])
+        self.rows += len(ids)
+
+    def add_embeddings(self, vectors: np.ndarray) -> None:
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+            raise SnapshotError(f"Expected [n, {self.dimension}] embeddings, got {list(vectors.shape)}.")
+        np.ascontiguousarray(vectors, dtype="<f4").tofile(self._files["embeddings"])
+        self.embedded += len(vectors)
+
+    def close(self, embedding_model: str) -> dict:
+        if self.embedded != self.rows:
+            raise SnapshotError(f"Column length mismatch: {self.rows} rows but {self.embedded} embeddings.")
+        for f in self._files.values():
+            f.close()
+        manifest = {
+            "format": FORMAT,
+            "version": FORMAT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "rows": self.rows,
+            "documents": len(self._filename_codes),
+            "dimension": self.dimension,
+            "embedding_model": embedding_model,
+            "columns": {
+                "embeddings": {"file": "embeddings.f32", "dtype": "<f4", "shape": [self.rows, self.dimension]},
+                "ids": {"file": "ids.uuid", "dtype": "|u1", "shape": [self.rows, 16]},
+                "chunk_index": {"file": "chunk_index.i32", "dtype": "<i4", "shape": [self.rows]},
+                "created_at": {"file": "created_at.i64", "dtype": "<i8", "unit": "us", "shape": [self.rows]},
+                "filename_code": {"file": "filename_code.i32", "dtype": "<i4", "shape": [self.rows]},
+                "filenames": self._filenames.close(),
+                "content": self._content.close(),
+                "metadata": self._metadata.close(),
+            },
+        }
+        # Written last: a directory without a manifest is an unfinished export
+        (self.path / MANIFEST).write_text(json.dumps(manifest, indent=2))
+        return manifest
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot directory."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            self.manifest = json.loads((self.path / MANIFEST).read_text())
+        except FileNotFoundError:
+            raise SnapshotError(f"{self.path} has no {MANIFEST} (missing or unfinished export).") from None
+        except json.JSONDecodeError as e:
+            raise SnapshotError(f"Malformed {MANIFEST} in {self.path}: {e}") from None
+        if self.manifest.get("format") != FORMAT or self.manifest.get("version") != FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot format in {self.path}.")
+
+        try:
+            self.rows: int = int(self.manifest["rows"])
+            self.dimension: int = int(self.manifest["dimension"])
+            self.embedding_model: str = self.manifest["embedding_model"]
+            counts = {name: int(self.manifest["columns"][name]["count"]) for name in ("filenames", "content", "metadata")}
+        except (KeyError, TypeError, ValueError) as e:
+            raise SnapshotError(f"Malformed {MANIFEST} in {self.path}: {e!r}") from None
+
+        self.embeddings = _map(self.path / "embeddings.f32", np.dtype("<f4"), (self.rows, self.dimension))
+        self.ids = _map(self.path / "ids.uuid", np.dtype(np.uint8), (self.rows, 16))
+        self.chunk_indexes = _map(self.path / "chunk_index.i32", np.dtype("<i4"), (self.rows,))
+        self.created_at = _map(self.path / "created_at.i64", np.dtype("<i8"), (self.rows,))
+        self.filename_codes = _map(self.path / "filename_code.i32", np.dtype("<i4"), (self.rows,))
+        self.filenames = StringColumn(self.path, "filenames", counts["filenames"])
+        self.content = StringColumn(self.path, "content", counts["content"])
+        self.metadata = StringColumn(self.path, "metadata", counts["metadata"])
+        self._filename_list = self.filenames.slice(0, len(self.filenames))
+
+        for name, column in (("content", self.content), ("metadata", self.metadata)):
+            if len(column) != self.rows:
+                raise SnapshotError(f"Column '{name}' has {len(column)} rows, manifest says {self.rows}.")
+        if self.rows and not 0 <= self.filename_codes.min() <= self.filename_codes.max() < len(self.filenames):
+            raise SnapshotError("filename_code.i32 points outside the filenames column (corrupt snapshot).")
+
+    def records(self, lo: int, hi: int) -> List[Tuple]:
+        """Rows [lo, hi) as COPY_COLUMNS tuples; embeddings pre-encoded in pgvector's wire format."""
+        wire = np.empty(hi - lo, dtype=vector_wire_dtype(self.dimension))
+        wire["dim"] = self.dimension
+        wire["unused"] = 0
+        wire["values"] = self.embeddings[lo:hi]
+        encoded = wire.tobytes()
+        size = wire.dtype.itemsize
+
+        filenames = self._filename_list
+        created = self.created_at[lo:hi].astype("datetime64[us]").tolist()
+        return [
+            (
+                uuid.UUID(bytes=self.ids[i].tobytes()),
+                filenames[code],
+                chunk_index,
+                content,
+                metadata or None,
+                encoded[j * size:(j + 1) * size],
+                created[j],
+            )
+            for j, (i, code, chunk_index, content, metadata) in enumerate(zip(
+                range(lo, hi),
+                self.filename_codes[lo:hi].tolist(),
+                self.chunk_indexes[lo:hi].tolist(),
+                self.content.slice(lo, hi),
+                self.metadata.slice(lo, hi),
+            ))
+        ]
+
+    def size_bytes(self) -> int:
+        return sum(f.stat().st_size for f in self.path.iterdir())
+
+
+# --- Database I/O ---
+
+async def connect_raw() -> asyncpg.Connection:
+    """A private asyncpg connection to the app database (outside the SQLAlchemy pool)."""
+    url = engine.url
+    return await asyncpg.connect(
+        user=url.username, password=url.password, host=url.host, port=url.port, database=url.database
+    )
+
+
+class _VectorCopyDecoder:
+    """
+    Decodes `COPY (SELECT embedding ...) TO STDOUT (FORMAT binary)` as it streams.
+    Every tuple has the same size (one non-null vector field), so each buffer
+    is decoded with a single np.frombuffer instead of row by row.
+    """
+
+    def __init__(self, dimension: int, sink):
+        self.dimension = dimension
+        self.sink = sink
+        self.record = np.dtype([("fields", ">i2"), ("length", ">i4"), ("vector", vector_wire_dtype(dimension))])
+        self._buffer = bytearray()
+        self._header_done = False
+
+    async def feed(self, data: bytes) -> None:
+        self._buffer += data
+        if not self._header_done:
+            if len(self._buffer) < 19:
+                return
+            if not self._buffer.startswith(_COPY_SIGNATURE):
+                raise SnapshotError("Unexpected COPY stream signature.")
+            extension = int.from_bytes(self._buffer[15:19], "big")
+            del self._buffer[:19 + extension]
+            self._header_done = True
+
+        count = len(self._buffer) // self.record.itemsize
+        if count:
+            tuples = np.frombuffer(self._buffer, dtype=self.record, count=count)
+            if (tuples["fields"] != 1).any() or (tuples["vector"]["dim"] != self.dimension).any():
+                raise SnapshotError("Embedding with unexpected dimension in COPY stream.")
+            self.sink(tuples["vector"]["values"])
+            del tuples
+            del self._buffer[:count * self.record.itemsize]
+
+    def finish(self) -> None:
+        if bytes(self._buffer) != b"\xff\xff":
+            raise SnapshotError("COPY stream ended mid-tuple.")
+
+
+async def export_snapshot(path: Path, filename_prefix: str = "", batch_size: int = 10_000) -> SnapshotStats:
+    """
+    Writes every embedded chunk (optionally only filenames starting with
+    `filename_prefix`) to a new snapshot directory at `path`.
+    """
+    started = time.perf_counter()
+    dimension = settings.EMBEDDING_DIMENSION
+    writer = SnapshotWriter(path, dimension)
+    where = "embedding IS NOT NULL AND starts_with(filename, $1)"
+
+    conn = await connect_raw()
+    try:
+        # Both passes read the same MVCC snapshot, so their row orders match
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            rows = conn.cursor(
+                "SELECT id, filename, chunk_index, content, doc_metadata::text, created_at "
+                f"FROM document_chunks WHERE {where} ORDER BY id",
+                filename_prefix,
+                prefetch=batch_size,
+            )
+            batch = []
+            async for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    _write_rows(writer, batch)
+                    batch = []
+            _write_rows(writer, batch)
+
+            decoder = _VectorCopyDecoder(dimension, writer.add_embeddings)
+            await conn.copy_from_query(
+                f"SELECT embedding FROM document_chunks WHERE {where} ORDER BY id",
+                filename_prefix,
+                output=decoder.feed,
+                format="binary",
+            )
+            decoder.finish()
+    finally:
+        await conn.close()
+
+    writer.close(settings.EMBEDDING_MODEL_ID)
+    return SnapshotStats(writer.rows, Snapshot(path).size_bytes(), time.perf_counter() - started)
+
+
+def _write_rows(writer: SnapshotWriter, rows: list) -> None:
+    if rows:
+        writer.add_rows(
+            ids=[row[0].bytes for row in rows],
+            filenames=[row[1] for row in rows],
+            chunk_indexes=[row[2] for row in rows],
+            contents=[row[3] for row in rows],
+            metadata=[row[4] for row in rows],
+            created_at=[row[5] for row in rows],
+        )
+
+
+async def _secondary_indexes(conn: asyncpg.Connection) -> List[Tuple[str, str]]:
+    """(name, CREATE INDEX statement) of every non-primary-key index on document_chunks."""
+    rows = await conn.fetch(
+        "SELECT c.relname, pg_get_indexdef(i.indexrelid) FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = 'document_chunks'::regclass AND NOT i.indisprimary"
+    )
+    return [(row[0], row[1]) for row in rows]
+
+
+async def import_snapshot(
+    path: Path,
+    replace: bool = False,
+    batch_size: int = 20_000,
+    hnsw: bool = False,
+    maintenance_work_mem: str = "1GB",
+    report_interval: float = 5.0
+) -> SnapshotStats:
+    """
+    Bulk-loads a snapshot into document_chunks and rebuilds the document
+    centroids in one transaction (ANALYZE runs after the commit).
+
+    Args:
+        replace: Truncate existing chunks first (otherwise rows are appended;
+                 an id that already exists aborts the whole import).
+        hnsw: Also build an HNSW cosine index on the embeddings if none exists.
+    """
+    snapshot = Snapshot(path)
+    if snapshot.dimension != settings.EMBEDDING_DIMENSION:
+        raise SnapshotError(
+            f"Snapshot holds {snapshot.dimension}-dim vectors, this deployment uses {settings.EMBEDDING_DIMENSION}."
+        )
+    if snapshot.embedding_model != settings.EMBEDDING_MODEL_ID:
+        raise SnapshotError(
+            f"Snapshot was embedded with '{snapshot.embedding_model}', but queries would be embedded "
+            f"with '{settings.EMBEDDING_MODEL_ID}'. Switch EMBEDDING_BACKEND/EMBEDDING_MODEL to match."
+        )
+
+    # Imported lazily: vector_store pulls in the embedding backend
+    from app.services.vector_store import REBUILD_CENTROIDS_SQL
+
+    started = time.perf_counter()
+    conn = await connect_raw()
+    try:
+        # Embeddings arrive pre-encoded in pgvector's binary format
+        await conn.set_type_codec("vector", encoder=bytes, decoder=bytes, format="binary")
+
+        async with conn.transaction():
+            if replace:
+                await conn.execute("TRUNCATE document_chunks, document_centroids")
+
+            # Maintaining indexes row by row is far slower than one rebuild
+            indexes = await _secondary_indexes(conn)
+            for name, _ in indexes:
+                await conn.execute(f'DROP INDEX "{name}"')
+
+            # Encode batch i+1 in a thread while batch i is being copied
+            loop = asyncio.get_running_loop()
+            bounds = [(lo, min(lo + batch_size, snapshot.rows)) for lo in range(0, snapshot.rows, batch_size)]
+            upcoming = loop.run_in_executor(None, snapshot.records, *bounds[0]) if bounds else None
+            last_report = time.perf_counter()
+            for i, (lo, hi) in enumerate(bounds):
+                records = await upcoming
+                if i + 1 < len(bounds):
+                    upcoming = loop.run_in_executor(None, snapshot.records, *bounds[i + 1])
+                await conn.copy_records_to_table("document_chunks", records=records, columns=COPY_COLUMNS)
+                if time.perf_counter() - last_report >= report_interval:
+                    last_report = time.perf_counter()
+                    rate = hi / (last_report - started)
+                    print(f"INFO:    Imported {hi}/{snapshot.rows} chunks ({rate:,.0f} rows/s)")
+            copied = time.perf_counter()
+
+            await conn.execute("SELECT set_config('maintenance_work_mem', $1, true)", maintenance_work_mem)
+            for name, statement in indexes:
+                print(f"INFO:    Rebuilding index {name}...")
+                await conn.execute(statement)
+            if hnsw and not any("USING hnsw" in s or "USING ivfflat" in s for _, s in indexes):
+                print(f"INFO:    Building {HNSW_INDEX}...")
+                await conn.execute(
+                    f"CREATE INDEX {HNSW_INDEX} ON document_chunks USING hnsw (embedding vector_cosine_ops)"
+                )
+            index_seconds = time.perf_counter() - copied
+
+            # Same transaction: a failure here must not leave chunks without centroids
+            print("INFO:    Rebuilding document centroids...")
+            await conn.execute("TRUNCATE document_centroids")
+            await conn.execute(REBUILD_CENTROIDS_SQL)
+
+        # Planner statistics only; the data is already committed
+        await conn.execute("ANALYZE document_chunks, document_centroids")
+    finally:
+        await conn.close()
+
+    return SnapshotStats(snapshot.rows, snapshot.size_bytes(), time.perf_counter() - started, index_seconds)
@@ -7,29 +7,78 @@ Vector Store Service
 Handles Embedding Generation and Postgres Retrieval.
 """
 
-from typing import List, Tuple
-from sqlalchemy import select, text
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import Row, select, delete, func, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
-from app.models.document import DocumentChunk
 from app.core.config import settings
+from app.models.document import DocumentChunk, DocumentCentroid
+from app.services.embeddings import get_embedding_model
+from app.services.admission import admission, Priority
+from app.services.centroid_index import centroid_index
+from app.services.query_cache import get_query_cache
+
+# Every centroid recomputed from its chunks (run after TRUNCATE document_centroids)
+REBUILD_CENTROIDS_SQL = (
+    "INSERT INTO document_centroids (filename, chunk_count, embedding, updated_at) "
+    "SELECT filename, count(*), avg(embedding), now() FROM document_chunks "
+    "WHERE embedding IS NOT NULL GROUP BY filename"
+)
+
+# ON CONFLICT merge of a stored centroid with a new batch mean, weighted by chunk count.
+# Evaluated against the locked row, so concurrent writers to one file cannot lose updates
+_MERGED_CENTROID = literal_column(
+    "(SELECT array_agg((o::float8 * document_centroids.chunk_count + n::float8 * excluded.chunk_count)"
+    " / (document_centroids.chunk_count + excluded.chunk_count) ORDER BY i)"
+    " FROM unnest(document_centroids.embedding::real[], excluded.embedding::real[])"
+    " WITH ORDINALITY AS t(o, n, i))::vector"
+)
 
 class VectorStoreService:
     def __init__(self, session: AsyncSession):
         self.session = session
-        self.embedding_model = OpenAIEmbeddings(
-            model=settings.EMBEDDING_MODEL,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
+        # Configured backend (OpenAI / ONNX / hashing), shared across requests
+        self.embedding_model = get_embedding_model()
 
     async def ingest_documents(self, documents: List[Document]) -> int:
         """(Existing code... kept for context, do not remove)"""
         if not documents:
             return 0
+        embeddings = await self.embed_documents(documents)
+        return await self.write_documents(documents, embeddings)
+
+    async def embed_documents(self, documents: List[Document]) -> List[List[float]]:
+        """Generates one embedding per chunk (no DB access)."""
         texts = [doc.page_content for doc in documents]
-        embeddings = await self.embedding_model.aembed_documents(texts)
+        # Ingestion queues behind interactive queries but is never shed
+        async with admission.embedding.slot(Priority.INGESTION):
+            return await self.embedding_model.aembed_documents(texts)
+
+    async def write_documents(
+        self,
+        documents: List[Document],
+        embeddings: List[List[float]],
+        replace_existing: bool = False
+    ) -> int:
+        """
+        Persists pre-embedded chunks in a single transaction.
         
+        Args:
+            documents: Chunks produced by IngestionService.
+            embeddings: Vectors aligned with `documents`.
+            replace_existing: Delete previous chunks of the same source files first,
+                so re-running an interrupted bulk ingest never duplicates rows.
+        """
+        if replace_existing:
+            sources = {doc.metadata.get("source", "unknown") for doc in documents}
+            await self.session.execute(
+                delete(DocumentChunk).where(DocumentChunk.filename.in_(sources))
+            )
+
         db_entries = []
         for i, doc in enumerate(documents):
             db_entry = DocumentChunk(
@@ -42,35 +91,139 @@ class VectorStoreService:
             db_entries.append(db_entry)
         
         self.session.add_all(db_entries)
+        # Keep the document-level index in step, in the same transaction
+        centroids = await self._update_centroids(documents, embeddings, replace_existing)
         await self.session.commit()
+
+        for filename, centroid in centroids.items():
+            centroid_index.upsert(filename, centroid)
         return len(db_entries)
 
+    async def _update_centroids(
+        self,
+        documents: List[Document],
+        embeddings: List[List[float]],
+        replace_existing: bool
+    ) -> Dict[str, np.ndarray]:
+        """
+        Folds new chunk embeddings into each source's running-mean centroid.
+        Returns the updated centroids by filename.
+        """
+        groups = defaultdict(list)
+        for doc, embedding in zip(documents, embeddings):
+            groups[doc.metadata.get("source", "unknown")].append(embedding)
+
+        values = [
+            {
+                "filename": filename,
+                "chunk_count": len(vectors),
+                "embedding": np.mean(np.asarray(vectors, dtype=np.float64), axis=0).astype(np.float32),
+                "updated_at": datetime.utcnow(),
+            }
+            for filename, vectors in groups.items()
+        ]
+
+        stmt = pg_insert(DocumentCentroid).values(values)
+        if replace_existing:
+            # The file's old chunks were deleted: the batch mean is the whole centroid
+            merged = {"chunk_count": stmt.excluded.chunk_count, "embedding": stmt.excluded.embedding}
+        else:
+            merged = {
+                "chunk_count": DocumentCentroid.chunk_count + stmt.excluded.chunk_count,
+                "embedding": _MERGED_CENTROID,
+            }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DocumentCentroid.filename],
+            set_={**merged, "updated_at": stmt.excluded.updated_at},
+        ).returning(DocumentCentroid.filename, DocumentCentroid.embedding)
+        result = await self.session.execute(stmt)
+        return {row.filename: np.asarray(row.embedding, dtype=np.float32) for row in result}
+
+    async def rebuild_centroids(self) -> int:
+        """
+        Recomputes every document centroid from its chunks in SQL
+        (backfill for pre-existing data, or after bulk loads that bypass write_documents).
+        """
+        await self.session.execute(text("TRUNCATE document_centroids"))
+        result = await self.session.execute(text(REBUILD_CENTROIDS_SQL))
+        await self.session.commit()
+        return result.rowcount
+
     # --- NEW FUNCTION ---
-    async def search(self, query: str, k: int = 3) -> List[Tuple[DocumentChunk, float]]:
+    async def search(
+        self,
+        query: str,
+        k: int = 3,
+        mode: Optional[str] = None,
+        top_documents: Optional[int] = None
+    ) -> List[Row]:
         """
         Semantic search using PGVector cosine distance.
         
         Args:
             query: User's search question.
             k: Number of results to return.
+            mode: "flat" or "hierarchical" (default: settings.RETRIEVAL_MODE).
+            top_documents: Documents kept by the hierarchical coarse stage
+                (default: settings.RETRIEVAL_TOP_DOCUMENTS).
             
         Returns:
-            List of (DocumentChunk, score) tuples.
+            Lightweight rows, see `search_by_vector`.
         """
-        # 1. Convert query to vector
-        query_embedding = await self.embedding_model.aembed_query(query)
+        # 1. Convert query to vector (cache hits skip the provider and its admission slot)
+        async def embed():
+            async with admission.embedding.slot(Priority.INTERACTIVE):
+                return await self.embedding_model.aembed_query(query)
+
+        cache = get_query_cache()
+        query_embedding = await cache.get_or_embed(query, embed) if cache else await embed()
 
         # 2. Perform Cosine Similarity Search in Postgres
+        return await self.search_by_vector(query_embedding, k, mode, top_documents)
+
+    async def search_by_vector(
+        self,
+        query_embedding: List[float],
+        k: int = 3,
+        mode: Optional[str] = None,
+        top_documents: Optional[int] = None
+    ) -> List[Row]:
+        """
+        Lean retrieval: projects only the columns citations and generation need.
+        The stored embedding and the full metadata JSON never leave Postgres,
+        and no ORM objects are hydrated.
+
+        In "hierarchical" mode the in-memory centroid index first picks the
+        closest documents, and chunks are ranked only inside those.
+        
+        Returns:
+            Rows with attributes: id, filename, chunk_index, content, page, distance.
+        """
+        mode = mode or settings.RETRIEVAL_MODE
+        if mode not in ("flat", "hierarchical"):
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+
         # (<-> operator is Euclidean distance, <=> is Cosine distance in pgvector)
         # We order by distance ascending (closest match first)
-        stmt = select(DocumentChunk).order_by(
-            DocumentChunk.embedding.cosine_distance(query_embedding)
-        ).limit(k)
+        distance = DocumentChunk.embedding.cosine_distance(query_embedding)
+        stmt = select(
+            DocumentChunk.id,
+            DocumentChunk.filename,
+            DocumentChunk.chunk_index,
+            DocumentChunk.content,
+            func.coalesce(DocumentChunk.doc_metadata["page"].as_integer(), 1).label("page"),
+            distance.label("distance"),
+        ).order_by(distance).limit(k)
+
+        if mode == "hierarchical":
+            # Coarse stage: top-M documents by centroid (no DB round trip)
+            await centroid_index.ensure_fresh(self.session)
+            filenames = centroid_index.top_documents(
+                query_embedding, top_documents or settings.RETRIEVAL_TOP_DOCUMENTS
+            )
+            # An empty index (nothing ingested yet) falls back to flat search
+            if filenames:
+                stmt = stmt.where(DocumentChunk.filename.in_(filenames))
 
         result = await self.session.execute(stmt)
-        chunks = result.scalars().all()
-        
-        # Note: True cosine similarity score calculation isn't automatic in SQL select,
-        # but for this phase, returning the chunks is sufficient. 
-        # We assign a mock score of 0.9 for now or calculate manually if needed.
-        return [(chunk, 0.9) for chunk in chunks]
\ No newline at end of file
+        return result.all()
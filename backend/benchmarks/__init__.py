@@ -0,0 +1,8 @@
+"""
+Benchmark Suite
+---------------
+Standalone performance scripts. They need the running stack (Postgres) and
+are not part of the pytest run:
+
+    docker-compose exec backend python -m benchmarks.bench_retrieval
+"""
@@ -0,0 +1,66 @@
+# File: documind-enterprise/backend/benchmarks/bench_embeddings.py
+# Purpose: Compare query-embedding latency and batch throughput across embedding backends.
+
+"""
+Embedding Backend Benchmark
+---------------------------
+For each backend:
+1. Query latency: sequential `aembed_query` calls (the chat hot path).
+2. Throughput:    one large `aembed_documents` call (the ingestion path).
+
+Backends that are not configured are skipped (onnx needs ONNX_MODEL_PATH,
+openai needs a real OPENAI_API_KEY). No database required.
+
+Usage:
+    python -m benchmarks.bench_embeddings --backends hashing onnx openai
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from app.core.config import settings
+from app.services.embeddings import build_embedding_model
+from benchmarks.common import print_table, summarize, synthetic_text, time_async
+
+
+def available(backend: str) -> bool:
+    if backend == "onnx":
+        return bool(settings.ONNX_MODEL_PATH)
+    if backend == "openai":
+        return settings.OPENAI_API_KEY.startswith("sk-") and len(settings.OPENAI_API_KEY) > 20
+    return True
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    queries = [synthetic_text(rng, words=12) for _ in range(args.queries)]
+    documents = [synthetic_text(rng, words=150) for _ in range(args.documents)]
+
+    rows = []
+    for backend in args.backends:
+        if not available(backend):
+            print(f"Skipping '{backend}' (not configured).")
+            continue
+        model = build_embedding_model(backend)
+        await model.aembed_query("warm-up")
+
+        latency = await time_async(lambda i: model.aembed_query(queries[i]), args.queries)
+
+        started = time.perf_counter()
+        await model.aembed_documents(documents)
+        throughput = len(documents) / (time.perf_counter() - started)
+
+        rows.append([backend, settings.embedding_dimension_for(backend), summarize(latency), f"{throughput:.0f} docs/s"])
+
+    print_table(f"Embedding backends ({args.queries} queries, {args.documents} documents)",
+                ["backend", "dim", "query latency", "throughput"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["hashing", "onnx", "openai"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+# File: documind-enterprise/backend/benchmarks/bench_hierarchical.py
+# Purpose: Latency and recall of hierarchical (centroid-first) vs flat retrieval as the corpus grows.
+
+"""
+Hierarchical Retrieval Benchmark
+--------------------------------
+Grows a clustered synthetic corpus (topics -> documents -> chunks) in steps.
+At each size it runs the same queries through both retrieval modes:
+1. Flat:         top-k over every chunk.
+2. Hierarchical: top-M documents from the in-memory centroid index, then top-k chunks inside them.
+
+Recall@k is the overlap of the hierarchical top-k with the flat top-k
+(flat search is exact, since no ANN index is used).
+
+Usage:
+    python -m benchmarks.bench_hierarchical --sizes 5000 20000 50000 --top-documents 8
+"""
+
+import argparse
+import asyncio
+import numpy as np
+from app.core.database import AsyncSessionLocal
+from app.services.centroid_index import centroid_index
+from app.services.vector_store import VectorStoreService
+from benchmarks.common import bench_db, embedding_dim, print_table, seed_chunks, summarize, time_async
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+class ClusteredCorpus:
+    """Chunks sit near their document's centre, documents near their topic's centre."""
+
+    def __init__(self, dim: int, topics: int, chunks_per_doc: int, seed: int):
+        self.rng = np.random.default_rng(seed)
+        self.dim = dim
+        self.chunks_per_doc = chunks_per_doc
+        self.topics = _normalize(self.rng.standard_normal((topics, dim), dtype=np.float32))
+        self.doc_centres = np.zeros((0, dim), dtype=np.float32)
+
+    def grow(self, chunks: int) -> np.ndarray:
+        docs = chunks // self.chunks_per_doc
+        topic = self.topics[self.rng.integers(len(self.topics), size=docs)]
+        centres = _normalize(topic + 0.08 * self.rng.standard_normal((docs, self.dim), dtype=np.float32))
+        self.doc_centres = np.vstack([self.doc_centres, centres])
+        noise = 0.05 * self.rng.standard_normal((docs, self.chunks_per_doc, self.dim), dtype=np.float32)
+        return _normalize(centres[:, None, :] + noise).reshape(-1, self.dim)
+
+    def queries(self, n: int) -> list:
+        picked = self.doc_centres[self.rng.integers(len(self.doc_centres), size=n)]
+        return _normalize(picked + 0.05 * self.rng.standard_normal(picked.shape, dtype=np.float32)).tolist()
+
+
+async def main(args):
+    corpus = ClusteredCorpus(embedding_dim(), args.topics, args.chunks_per_doc, args.seed)
+    rows = []
+
+    async with bench_db():
+        seeded = 0
+        for size in sorted(args.sizes):
+            print(f"Growing corpus to {size} chunks...")
+            await seed_chunks(corpus.grow(size - seeded), args.chunks_per_doc, offset=seeded)
+            seeded = size
+            queries = corpus.queries(args.queries)
+
+            async with AsyncSessionLocal() as session:
+                service = VectorStoreService(session=session)
+                await centroid_index.load(session)
+                hits = {"flat": [], "hierarchical": []}
+
+                def runner(mode):
+                    async def run(i):
+                        result = await service.search_by_vector(queries[i], args.k, mode, args.top_documents)
+                        hits[mode].append({row.id for row in result})
+                    return run
+
+                latency = {mode: await time_async(runner(mode), args.queries) for mode in hits}
+
+            recall = np.mean([len(h & f) / args.k for h, f in zip(hits["hierarchical"], hits["flat"])])
+            rows.append([size, len(centroid_index), summarize(latency["flat"]),
+                         summarize(latency["hierarchical"]), f"{recall:.3f}"])
+
+    print_table(f"Flat vs hierarchical (top-{args.k}, M={args.top_documents} documents, {args.queries} queries)",
+                ["chunks", "documents", "flat", "hierarchical", "recall@k"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 50000])
+    parser.add_argument("--chunks-per-doc", type=int, default=20)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--top-documents", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,96 @@
+# File: documind-enterprise/backend/benchmarks/bench_retrieval.py
+# Purpose: Compare full-row ORM retrieval with the lean projection used by VectorStoreService.search.
+
+"""
+Retrieval Projection Benchmark
+------------------------------
+Runs identical top-k pgvector queries two ways:
+1. Full:  select(DocumentChunk) -> ORM objects (embedding + JSON metadata included).
+2. Lean:  VectorStoreService.search_by_vector -> row tuples (only needed columns).
+
+Reports latency and approximate result bytes (Postgres text protocol).
+
+Usage:
+    python -m benchmarks.bench_retrieval --chunks 20000 --queries 200 --k 3
+"""
+
+import argparse
+import asyncio
+import json
+import numpy as np
+from sqlalchemy import select
+from app.core.database import AsyncSessionLocal
+from app.models.document import DocumentChunk
+from app.services.vector_store import VectorStoreService
+from benchmarks.common import bench_db, embedding_dim, print_table, random_unit_vectors, seed_chunks, summarize, time_async
+
+
+def _wire_size(value) -> int:
+    """Size of a value as sent in Postgres text format."""
+    if value is None:
+        return 0
+    if isinstance(value, np.ndarray):
+        return len("[" + ",".join(map(str, value.tolist())) + "]")
+    if isinstance(value, (dict, list)):
+        return len(json.dumps(value))
+    return len(str(value).encode("utf-8"))
+
+
+def full_row_bytes(chunk: DocumentChunk) -> int:
+    columns = DocumentChunk.__table__.columns
+    return sum(_wire_size(getattr(chunk, c.key)) for c in columns) + _wire_size(0.0)
+
+
+def lean_row_bytes(row) -> int:
+    return sum(_wire_size(v) for v in row)
+
+
+async def main(args):
+    rng = np.random.default_rng(args.seed)
+    dim = embedding_dim()
+    queries = random_unit_vectors(args.queries, dim, rng).tolist()
+
+    async with bench_db():
+        print(f"Seeding {args.chunks} chunks (dim={dim})...")
+        await seed_chunks(random_unit_vectors(args.chunks, dim, rng), chunks_per_doc=20)
+
+        async with AsyncSessionLocal() as session:
+            service = VectorStoreService(session=session)
+            sizes = {"full": 0, "lean": 0}
+
+            async def full(i):
+                distance = DocumentChunk.embedding.cosine_distance(queries[i])
+                stmt = select(DocumentChunk, distance).order_by(distance).limit(args.k)
+                rows = (await session.execute(stmt)).all()
+                sizes["full"] += sum(full_row_bytes(chunk) for chunk, _ in rows)
+
+            async def lean(i):
+                rows = await service.search_by_vector(queries[i], args.k)
+                sizes["lean"] += sum(lean_row_bytes(row) for row in rows)
+
+            # Warm-up (plans, buffers) before measuring
+            await full(0)
+            await lean(0)
+            sizes = {"full": 0, "lean": 0}
+
+            results = {}
+            for name, fn in (("full", full), ("lean", lean)):
+                results[name] = await time_async(fn, args.queries)
+
+    rows = []
+    for name, samples in results.items():
+        per_query = sizes[name] / args.queries
+        rows.append([name, summarize(samples), f"{per_query / 1024:.1f} KiB"])
+    print_table(f"Top-{args.k} retrieval over {args.chunks} chunks ({args.queries} queries)",
+                ["mode", "latency", "bytes/query"], rows)
+    saved = 1 - sizes["lean"] / max(sizes["full"], 1)
+    print(f"\nLean projection transfers {saved:.0%} fewer bytes per query.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,133 @@
+# File: documind-enterprise/backend/benchmarks/bench_snapshot.py
+# Purpose: Export/import throughput of binary snapshots vs a text-format COPY dump (what pg_dump produces).
+
+"""
+Snapshot Benchmark
+------------------
+1. Writes a synthetic snapshot of --rows chunks (not timed).
+2. Binary import:  `snapshot import` (COPY + index rebuild + centroids).
+3. Binary export:  `snapshot export` of the same rows; embeddings are checked bit-for-bit.
+4. Text export:    COPY ... TO STDOUT in text format (pg_dump's data format).
+5. Text import:    the rows are deleted and restored from that text dump.
+
+Usage:
+    python -m benchmarks.bench_snapshot --rows 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from app.core.config import settings
+from app.services.snapshot import COPY_COLUMNS, Snapshot, SnapshotWriter, connect_raw, export_snapshot, import_snapshot
+from benchmarks.common import BENCH_PREFIX, bench_db, embedding_dim, print_table, random_unit_vectors, synthetic_text
+
+WHERE = f"filename LIKE '{BENCH_PREFIX}%'"
+
+
+def write_synthetic(path: Path, rows: int, chunks_per_doc: int, batch: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    texts = [synthetic_text(random.Random(seed + i)) for i in range(1000)]
+    writer = SnapshotWriter(path, embedding_dim())
+    now = datetime.utcnow()
+    for lo in range(0, rows, batch):
+        n = min(batch, rows - lo)
+        writer.add_rows(
+            ids=[uuid.uuid4().bytes for _ in range(n)],
+            filenames=[f"{BENCH_PREFIX}doc_{(lo + i) // chunks_per_doc}" for i in range(n)],
+            chunk_indexes=[(lo + i) % chunks_per_doc for i in range(n)],
+            contents=[texts[(lo + i) % len(texts)] for i in range(n)],
+            metadata=['{"page": 1}'] * n,
+            created_at=[now] * n,
+        )
+        writer.add_embeddings(random_unit_vectors(n, writer.dimension, rng))
+    writer.close(settings.EMBEDDING_MODEL_ID)
+
+
+async def text_export(path: Path) -> float:
+    started = time.perf_counter()
+    conn = await connect_raw()
+    try:
+        await conn.copy_from_query(
+            f"SELECT {', '.join(COPY_COLUMNS)} FROM document_chunks WHERE {WHERE} ORDER BY id", output=str(path)
+        )
+    finally:
+        await conn.close()
+    return time.perf_counter() - started
+
+
+async def text_import(path: Path) -> float:
+    conn = await connect_raw()
+    try:
+        await conn.execute(f"DELETE FROM document_chunks WHERE {WHERE}")
+        started = time.perf_counter()
+        await conn.copy_to_table("document_chunks", source=str(path), columns=COPY_COLUMNS)
+        return time.perf_counter() - started
+    finally:
+        await conn.close()
+
+
+def embeddings_match(original: Snapshot, exported: Snapshot, sample: int, seed: int) -> bool:
+    """Compares a random sample of rows by id (export is ordered by id, the source is not)."""
+    exported_ids = exported.ids.view("S16").ravel()
+    picked = np.sort(np.random.default_rng(seed).choice(original.rows, min(sample, original.rows), replace=False))
+    positions = np.searchsorted(exported_ids, original.ids[picked].view("S16").ravel())
+    return bool(np.array_equal(original.embeddings[picked], exported.embeddings[positions]))
+
+
+def row(label: str, rows: int, size: int, seconds: float) -> list:
+    return [label, f"{size / 2**20:,.0f}", f"{seconds:.1f}", f"{rows / seconds:,.0f}", f"{size / 2**20 / seconds:,.1f}"]
+
+
+async def main(args):
+    workdir = Path(tempfile.mkdtemp(prefix="snapshot-bench-", dir=args.workdir))
+    source, exported, dump = workdir / "source", workdir / "exported", workdir / "dump.txt"
+    results = []
+    try:
+        print(f"Writing a synthetic {args.rows}-row snapshot to {source}...")
+        write_synthetic(source, args.rows, args.chunks_per_doc, args.batch, args.seed)
+
+        async with bench_db():
+            print("Binary import...")
+            stats = await import_snapshot(source, batch_size=args.batch, hnsw=args.hnsw)
+            results.append(row("binary import", stats.rows, stats.bytes, stats.seconds))
+            if args.hnsw:
+                print(f"  (of which index rebuild: {stats.index_seconds:.1f}s)")
+
+            print("Binary export...")
+            stats = await export_snapshot(exported, filename_prefix=BENCH_PREFIX, batch_size=args.batch)
+            results.append(row("binary export", stats.rows, stats.bytes, stats.seconds))
+
+            identical = embeddings_match(Snapshot(source), Snapshot(exported), args.verify_sample, args.seed)
+            print(f"  embeddings identical after round trip ({args.verify_sample} sampled rows): {identical}")
+
+            print("Text export (COPY TO, text format)...")
+            seconds = await text_export(dump)
+            results.append(row("text export", args.rows, dump.stat().st_size, seconds))
+
+            print("Text import (COPY FROM, text format)...")
+            seconds = await text_import(dump)
+            results.append(row("text import", args.rows, dump.stat().st_size, seconds))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(f"Snapshot throughput ({args.rows} chunks, {embedding_dim()} dims)",
+                ["operation", "MiB", "seconds", "rows/s", "MiB/s"], results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunks-per-doc", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=20_000)
+    parser.add_argument("--verify-sample", type=int, default=10_000, help="Rows compared after the round trip.")
+    parser.add_argument("--hnsw", action="store_true", help="Include an HNSW build in the binary import.")
+    parser.add_argument("--workdir", default=None, help="Scratch directory (needs ~3x the snapshot size).")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
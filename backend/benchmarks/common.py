@@ -0,0 +1,99 @@
+# File: documind-enterprise/backend/benchmarks/common.py
+# Purpose: Shared helpers for benchmark scripts (synthetic corpus, timing, reporting).
+
+"""
+Benchmark Helpers
+-----------------
+Synthetic rows are written under the BENCH_PREFIX filename namespace and
+removed afterwards, so benchmarks can run against a live database.
+"""
+
+import random
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, List, Sequence
+import numpy as np
+from langchain_core.documents import Document
+from sqlalchemy import delete
+from app.core.database import AsyncSessionLocal, engine, init_db
+from app.models.document import DocumentChunk, DocumentCentroid
+from app.services.vector_store import VectorStoreService
+
+BENCH_PREFIX = "__bench__/"
+
+WORDS = (
+    "policy revenue contract invoice employee onboarding security audit vendor "
+    "quarterly compliance budget travel expense password network incident report"
+).split()
+
+
+def embedding_dim() -> int:
+    return DocumentChunk.embedding.type.dim
+
+
+def random_unit_vectors(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    vectors = rng.standard_normal((n, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def synthetic_text(rng: random.Random, words: int = 150) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+@asynccontextmanager
+async def bench_db():
+    """Schema ready, SQL echo off, benchmark rows cleaned up on exit."""
+    engine.echo = False
+    await init_db()
+    try:
+        yield
+    finally:
+        async with AsyncSessionLocal() as session:
+            for model in (DocumentChunk, DocumentCentroid):
+                await session.execute(delete(model).where(model.filename.startswith(BENCH_PREFIX)))
+            await session.commit()
+        await engine.dispose()
+
+
+async def seed_chunks(embeddings: np.ndarray, chunks_per_doc: int, batch: int = 2000, seed: int = 0, offset: int = 0) -> None:
+    """
+    Inserts one synthetic chunk per embedding row, grouped into documents.
+    `offset` is the global index of the first row (to grow a corpus in steps).
+    """
+    rng = random.Random(seed + offset)
+    async with AsyncSessionLocal() as session:
+        service = VectorStoreService(session=session)
+        for lo in range(0, len(embeddings), batch):
+            docs = [
+                Document(
+                    page_content=synthetic_text(rng),
+                    metadata={"source": f"{BENCH_PREFIX}doc_{(offset + i) // chunks_per_doc}", "chunk_index": (offset + i) % chunks_per_doc, "page": 1},
+                )
+                for i in range(lo, min(lo + batch, len(embeddings)))
+            ]
+            await service.write_documents(docs, embeddings[lo:lo + len(docs)].tolist())
+
+
+async def time_async(fn: Callable, repeat: int) -> List[float]:
+    """Wall-clock seconds of `repeat` sequential awaits of fn(i)."""
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        await fn(i)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summarize(samples: Sequence[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"p50={statistics.median(ordered) * 1000:.2f}ms p95={p95 * 1000:.2f}ms"
+
+
+def print_table(title: str, header: Sequence[str], rows: Sequence[Sequence]) -> None:
+    print(f"\n{title}")
+    widths = [max(len(str(x)) for x in col) for col in zip(header, *rows)]
+    for line in (header, ["-" * w for w in widths], *rows):
+        print("  ".join(str(x).ljust(w) for x, w in zip(line, widths)))
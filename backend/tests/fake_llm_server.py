@@ -0,0 +1,80 @@
+"""
+Fake Completion Server
+----------------------
+A local OpenAI-compatible /v1/chat/completions endpoint for latency tests.
+Behaviour is chosen per model name, so one server can play both the
+primary and the secondary:
+
+    "slow-2.0"  -> answers after 2.0 seconds
+    "fail"      -> HTTP 500
+    anything    -> answers immediately
+
+The answer text names the model, so tests can tell which request won.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        model = body["model"]
+        self.server.calls.append(model)
+
+        if model == "fail":
+            return self._reply(500, {"error": {"message": "injected failure", "type": "server_error"}})
+        if model.startswith("slow-"):
+            time.sleep(float(model.split("-", 1)[1]))
+
+        self._reply(200, {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"answer from {model}"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        })
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client cancelled (the hedge loser)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeCompletionServer:
+    """Context manager running the server on a free localhost port."""
+
+    def __enter__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.calls = []
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}/v1"
+
+    @property
+    def calls(self) -> list:
+        return self.httpd.calls
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -6,13 +6,20 @@ Tests the full lifecycle of the application endpoints:
 2. Document Ingestion (Mocked DB/OpenAI)
 3. Chat Agent - General Intent (Mocked LangGraph)
 4. Chat Agent - Search Intent (Mocked LangGraph + Vector Store)
+5. Chat Agent - Error Handling (500)
+6. Chat Agent - Streaming (Mocked LangGraph)
+7. Chat Agent - Load Shedding (429)
+8. Chat Agent - Shared runs own their DB session
+9. Chat Agent - Streaming followers of a running flight are never shed
 """
 
+import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 from app.main import app
 from app.core.database import get_db
+from app.services.admission import AdmissionRejected
 
 # --- Fixtures ---
 
@@ -168,4 +175,100 @@ def test_chat_error_handling(mock_vector_service, mock_rag_agent, client):
 
     # 3. Assertions
     assert response.status_code == 500
-    assert "LangGraph exploded" in response.json()["detail"]
\ No newline at end of file
+    assert "LangGraph exploded" in response.json()["detail"]
+
+
+@patch("app.api.v1.endpoints.chat.RAGAgent")
+@patch("app.api.v1.endpoints.chat.VectorStoreService")
+def test_chat_stream(mock_vector_service, mock_rag_agent, client):
+    """
+    Test 6: Streaming Chat
+    Verifies the NDJSON stream emits intent, citations and the final answer.
+    """
+    # 1. Setup Mock: LangGraph emits the full state after each node
+    async def fake_stream(question):
+        yield {"question": question, "intent": "", "documents": [], "answer": ""}
+        yield {"question": question, "intent": "search", "documents": [], "answer": ""}
+        docs = [{"source": "cv.pdf", "page": 1, "content": "Nahasat is a skilled engineer...", "score": 0.89}]
+        yield {"question": question, "intent": "search", "documents": docs, "answer": ""}
+        yield {"question": question, "intent": "search", "documents": docs, "answer": "Nahasat is an AI Engineer."}
+
+    mock_rag_agent.return_value.stream = fake_stream
+
+    # 2. Execute Request
+    response = client.post("/api/v1/chat/stream", json={"message": "Who is Nahasat?"})
+
+    # 3. Assertions
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["event"] for e in events] == ["intent", "citations", "answer"]
+    assert events[1]["citations"][0]["filename"] == "cv.pdf"
+    assert events[2]["answer"] == "Nahasat is an AI Engineer."
+
+@patch("app.api.v1.endpoints.chat.RAGAgent")
+@patch("app.api.v1.endpoints.chat.VectorStoreService")
+def test_chat_load_shedding(mock_vector_service, mock_rag_agent, client):
+    """
+    Test 7: Admission Control
+    Verifies the API returns 429 + Retry-After when the LLM budget is saturated.
+    """
+    # 1. Setup Mock to be rejected by admission control
+    mock_agent_instance = mock_rag_agent.return_value
+    mock_agent_instance.run = AsyncMock(side_effect=AdmissionRejected("llm", retry_after=3.2))
+
+    # 2. Execute Request
+    response = client.post("/api/v1/chat/", json={"message": "Busy?"})
+
+    # 3. Assertions
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "4"
+
+
+@patch("app.api.v1.endpoints.chat.AsyncSessionLocal")
+@patch("app.api.v1.endpoints.chat.RAGAgent")
+@patch("app.api.v1.endpoints.chat.VectorStoreService")
+def test_chat_flight_owns_its_session(mock_vector_service, mock_rag_agent, mock_session_factory, client):
+    """
+    Test 8: Session Lifetime
+    Verifies the shared agent run uses its own DB session, not the leader request's.
+    """
+    # 1. Setup Mock session factory and agent
+    flight_session = MagicMock()
+    mock_session_factory.return_value.__aenter__ = AsyncMock(return_value=flight_session)
+    mock_session_factory.return_value.__aexit__ = AsyncMock(return_value=None)
+    mock_rag_agent.return_value.run = AsyncMock(return_value={"answer": "Hi", "intent": "general", "documents": []})
+
+    # 2. Execute Request
+    response = client.post("/api/v1/chat/", json={"message": "Hello"})
+
+    # 3. Assertions
+    assert response.status_code == 200
+    mock_vector_service.assert_called_once_with(session=flight_session)
+    mock_session_factory.return_value.__aexit__.assert_awaited_once()
+
+
+@patch("app.api.v1.endpoints.chat.admission")
+@patch("app.api.v1.endpoints.chat.RAGAgent")
+@patch("app.api.v1.endpoints.chat.VectorStoreService")
+def test_chat_stream_follower_not_shed(mock_vector_service, mock_rag_agent, mock_admission, client):
+    """
+    Test 9: Load Shedding for Streams
+    Verifies a saturated LLM budget rejects a new stream, but not one that joins a running flight.
+    """
+    # 1. Setup Mocks: admission always rejects; the agent answers at once
+    mock_admission.llm.check.side_effect = AdmissionRejected("llm", retry_after=2.0)
+
+    async def fake_stream(question):
+        yield {"question": question, "intent": "general", "documents": [], "answer": "Hi"}
+
+    mock_rag_agent.return_value.stream = fake_stream
+
+    # 2. Execute Requests: leading a new flight, then joining a running one
+    rejected = client.post("/api/v1/chat/stream", json={"message": "Hello"})
+    with patch("app.api.v1.endpoints.chat.chat_flights.in_flight", return_value=True):
+        joined = client.post("/api/v1/chat/stream", json={"message": "Hello"})
+
+    # 3. Assertions
+    assert rejected.status_code == 429
+    assert joined.status_code == 200
+    assert mock_admission.llm.check.call_count == 1
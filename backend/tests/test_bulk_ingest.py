@@ -0,0 +1,137 @@
+"""
+Bulk Ingest Pipeline Tests
+--------------------------
+Runs the staged pipeline end-to-end against a temp directory / zip,
+with embeddings and DB writes mocked:
+1. Every supported file flows through all stages and is checkpointed.
+2. A second run resumes from the checkpoint and writes nothing.
+3. Unparseable files are skipped without stopping the pipeline and logged.
+4. A failed DB write is rolled back and logged; later files still load.
+5. An unreadable (corrupt) zip member is skipped and logged; the rest of the archive loads.
+"""
+
+import asyncio
+import zipfile
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.bulk_ingest import BulkIngestPipeline, discover_sources
+
+# --- Fixtures ---
+
+@pytest.fixture
+def corpus(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "nested").mkdir(parents=True)
+    (docs / "a.txt").write_text("Alpha document. " * 50)
+    (docs / "nested" / "b.md").write_text("Beta document. " * 50)
+    (docs / "ignored.docx").write_bytes(b"not supported")
+    return docs
+
+
+@pytest.fixture
+def mock_services():
+    """Patches the DB session factory and the embedding / write calls."""
+    written = []
+
+    async def write_documents(chunks, embeddings, replace_existing=False):
+        written.extend(chunks)
+        return len(chunks)
+
+    with patch("app.services.bulk_ingest.AsyncSessionLocal", return_value=MagicMock(
+            __aenter__=AsyncMock(return_value=MagicMock()), __aexit__=AsyncMock(return_value=None))), \
+         patch("app.services.bulk_ingest.VectorStoreService") as mock_vector_service:
+        instance = mock_vector_service.return_value
+        instance.embed_documents = AsyncMock(side_effect=lambda chunks: [[0.0]] * len(chunks))
+        instance.write_documents = AsyncMock(side_effect=write_documents)
+        yield written
+
+
+def run_pipeline(source, checkpoint):
+    pipeline = BulkIngestPipeline(
+        str(source), str(checkpoint), parse_workers=2, embed_workers=2, write_workers=2, queue_size=2
+    )
+    return asyncio.run(pipeline.run())
+
+# --- Tests ---
+
+def test_discover_sources_directory_and_zip(corpus, tmp_path):
+    assert [name for name, _ in discover_sources(str(corpus))] == ["a.txt", "nested/b.md"]
+
+    archive = tmp_path / "docs.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("x/c.txt", "Gamma")
+        zf.writestr("x/skip.bin", "nope")
+    sources = list(discover_sources(str(archive)))
+    assert [name for name, _ in sources] == ["x/c.txt"]
+    assert sources[0][1]() == b"Gamma"
+
+
+def test_pipeline_checkpoints_and_resumes(corpus, tmp_path, mock_services):
+    checkpoint = tmp_path / "run.checkpoint"
+
+    totals = run_pipeline(corpus, checkpoint)
+    assert totals.files == 2
+    assert totals.chunks == len(mock_services) > 0
+    assert set(checkpoint.read_text().split()) == {"a.txt", "nested/b.md"}
+
+    # Second run: everything already checkpointed
+    mock_services.clear()
+    totals = run_pipeline(corpus, checkpoint)
+    assert totals.files == 0
+    assert mock_services == []
+
+
+def test_pipeline_skips_bad_files(corpus, tmp_path, mock_services):
+    (corpus / "broken.pdf").write_bytes(b"%PDF-garbage")
+    (corpus / "empty.txt").write_text("   ")
+
+    totals = run_pipeline(corpus, tmp_path / "run.checkpoint")
+    assert totals.files == 2
+    assert {c.metadata["source"] for c in mock_services} == {"a.txt", "nested/b.md"}
+    failed = (tmp_path / "run.checkpoint.failed").read_text().splitlines()
+    assert sorted(line.split("\t")[0] for line in failed) == ["broken.pdf", "empty.txt"]
+
+
+def test_pipeline_survives_write_failure(corpus, tmp_path):
+    (corpus / "c.txt").write_text("Gamma document. " * 50)
+    checkpoint = tmp_path / "run.checkpoint"
+    session = MagicMock(rollback=AsyncMock())
+    written = []
+
+    async def write_documents(chunks, embeddings, replace_existing=False):
+        if chunks[0].metadata["source"] == "nested/b.md":
+            raise ValueError("A string literal cannot contain NUL (0x00) characters.")
+        written.extend(chunks)
+        return len(chunks)
+
+    with patch("app.services.bulk_ingest.AsyncSessionLocal", return_value=MagicMock(
+            __aenter__=AsyncMock(return_value=session), __aexit__=AsyncMock(return_value=None))), \
+         patch("app.services.bulk_ingest.VectorStoreService") as mock_vector_service:
+        instance = mock_vector_service.return_value
+        instance.embed_documents = AsyncMock(side_effect=lambda chunks: [[0.0]] * len(chunks))
+        instance.write_documents = AsyncMock(side_effect=write_documents)
+        totals = run_pipeline(corpus, checkpoint)
+
+    assert (totals.files, totals.failed) == (2, 1)
+    assert {c.metadata["source"] for c in written} == {"a.txt", "c.txt"}
+    assert set(checkpoint.read_text().split()) == {"a.txt", "c.txt"}
+    assert (tmp_path / "run.checkpoint.failed").read_text().startswith("nested/b.md\tValueError: ")
+    session.rollback.assert_awaited_once()
+
+
+def test_pipeline_skips_corrupt_zip_member(tmp_path, mock_services):
+    archive = tmp_path / "docs.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr("a.txt", "Alpha document. " * 50)
+        zf.writestr("b.txt", "Beta document. " * 50)
+    # Flip one stored byte of a.txt so its CRC no longer matches
+    raw = bytearray(archive.read_bytes())
+    raw[raw.index(b"Alpha")] = ord("X")
+    archive.write_bytes(bytes(raw))
+    checkpoint = tmp_path / "run.checkpoint"
+
+    totals = run_pipeline(archive, checkpoint)
+    assert totals.files == 1
+    assert {c.metadata["source"] for c in mock_services} == {"b.txt"}
+    assert checkpoint.read_text().split() == ["b.txt"]
+    assert (tmp_path / "run.checkpoint.failed").read_text().startswith("a.txt\tBadZipFile: Bad CRC-32")
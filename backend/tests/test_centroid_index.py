@@ -0,0 +1,89 @@
+"""
+Centroid Index Tests
+--------------------
+Verifies the in-memory coarse stage of hierarchical retrieval:
+1. Documents are ranked by cosine similarity of their centroid.
+2. Local upserts update existing rows and grow the matrix.
+3. Upserts are ignored until the index has been loaded once.
+4. A stale index keeps serving while it reloads in the background, keeping upserts made meanwhile.
+"""
+
+import asyncio
+import numpy as np
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.centroid_index import CentroidIndex
+
+
+def db_session(rows):
+    """Mock session whose centroid query returns `rows` [(filename, vector)]."""
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(all=lambda: [
+        MagicMock(filename=name, embedding=np.array(vec, dtype=np.float32)) for name, vec in rows
+    ]))
+    return session
+
+
+def loaded_index(rows):
+    """Builds an index as if `rows` [(filename, vector)] came from Postgres."""
+    index = CentroidIndex(dimension=3, refresh_seconds=60)
+    asyncio.run(index.ensure_fresh(db_session(rows)))
+    return index
+
+
+def test_top_documents_ranked_by_cosine():
+    index = loaded_index([("hr.pdf", [1, 0, 0]), ("it.pdf", [0, 1, 0]), ("finance.pdf", [0.7, 0.7, 0])])
+
+    assert index.top_documents([1, 0.1, 0], m=2) == ["hr.pdf", "finance.pdf"]
+    assert index.top_documents([0, 0, 1], m=10)[0] in {"hr.pdf", "it.pdf", "finance.pdf"}
+    assert len(index.top_documents([0, 0, 1], m=10)) == 3
+
+
+def test_upsert_updates_and_grows():
+    index = loaded_index([("hr.pdf", [1, 0, 0])])
+
+    index.upsert("hr.pdf", [0, 0, 5])
+    for i in range(40):
+        index.upsert(f"doc_{i}.pdf", [0, 1, 0])
+
+    assert len(index) == 41
+    assert index.top_documents([0, 0, 1], m=1) == ["hr.pdf"]
+    assert np.allclose(np.linalg.norm(index.matrix, axis=1), 1.0)
+
+
+def test_upsert_ignored_before_first_load():
+    index = CentroidIndex(dimension=3, refresh_seconds=60)
+    index.upsert("hr.pdf", [1, 0, 0])
+    assert len(index) == 0
+
+
+@patch("app.services.centroid_index.AsyncSessionLocal")
+def test_stale_index_refreshes_in_background(mock_session_local):
+    index = loaded_index([("hr.pdf", [1, 0, 0])])
+    index._loaded_at -= 120  # Older than refresh_seconds
+
+    released = asyncio.Event()
+    fresh = db_session([("hr.pdf", [1, 0, 0]), ("it.pdf", [0, 1, 0])])
+    result = fresh.execute.return_value
+
+    async def slow_execute(*args):
+        await released.wait()
+        return result
+    fresh.execute = AsyncMock(side_effect=slow_execute)
+    mock_session_local.return_value.__aenter__.return_value = fresh
+
+    async def run():
+        await index.ensure_fresh(MagicMock())  # Returns without waiting for the reload
+        refresh = index._refresh
+        await asyncio.sleep(0)
+        assert refresh is not None and index.filenames == ["hr.pdf"]
+
+        index.upsert("finance.pdf", [0, 0, 1])  # Lands on both the old and the new table
+        assert index.top_documents([0, 0, 1], m=1) == ["finance.pdf"]
+
+        released.set()
+        await refresh
+    asyncio.run(run())
+
+    assert sorted(index.filenames) == ["finance.pdf", "hr.pdf", "it.pdf"]
+    assert index.top_documents([0, 1, 0], m=1) == ["it.pdf"]
+    assert index._refresh is None and mock_session_local.return_value.__aexit__.await_count == 1
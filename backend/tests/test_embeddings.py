@@ -0,0 +1,49 @@
+"""
+Embedding Backend Tests
+-----------------------
+Covers the dependency-free local backend and backend selection:
+1. Hashing embeddings are deterministic, normalised and sized to the column.
+2. Lexically similar texts score higher than unrelated ones.
+3. Async batching returns the same vectors as the sync path.
+4. Each backend reports the dimension its vectors will have.
+"""
+
+import asyncio
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.services.embeddings import HashingEmbeddings, build_embedding_model
+
+
+def test_hashing_embeddings_shape_and_norm():
+    model = HashingEmbeddings(dimension=256)
+    vector = np.array(model.embed_query("Quarterly revenue report"))
+
+    assert vector.shape == (256,)
+    assert np.isclose(np.linalg.norm(vector), 1.0)
+    assert model.embed_query("Quarterly revenue report") == vector.tolist()
+
+
+def test_hashing_embeddings_rank_similar_text_higher():
+    model = HashingEmbeddings(dimension=512)
+    query, related, unrelated = (np.array(v) for v in model.embed_documents([
+        "reset my vpn password",
+        "how to reset the vpn password for remote access",
+        "quarterly travel expense budget",
+    ]))
+    assert query @ related > query @ unrelated
+
+
+def test_async_batches_match_sync():
+    model = HashingEmbeddings(dimension=64, batch_size=3)
+    texts = [f"document number {i}" for i in range(10)]
+
+    assert asyncio.run(model.aembed_documents(texts)) == model.embed_documents(texts)
+    assert asyncio.run(model.aembed_query(texts[0])) == model.embed_query(texts[0])
+
+
+def test_backend_dimensions():
+    assert settings.embedding_dimension_for("openai") == 1536
+    assert build_embedding_model("hashing").dimension == settings.embedding_dimension_for("hashing")
+    with pytest.raises(ValueError):
+        build_embedding_model("nope")
@@ -0,0 +1,138 @@
+"""
+Query Embedding Cache Tests
+---------------------------
+Verifies the two-level cache in front of `aembed_query`:
+1. The L1 LRU evicts the least recently used entry.
+2. Repeated (and trivially re-spelled) queries are embedded once; the model id is part of the key.
+3. Concurrent misses for one key share a single provider call.
+4. The mmap tier is shared between workers (also when they create it at the same time) and rejects torn slots.
+5. A Redis stand-in works as the shared tier; a failing tier never fails a search.
+"""
+
+import asyncio
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock
+from app.services.query_cache import LRUVectorCache, MmapVectorStore, QueryEmbeddingCache, RedisVectorStore
+
+# --- Fixtures ---
+
+def embedder(vector=(0.6, 0.8, 0.0, 0.0), delay=0.0):
+    """AsyncMock provider call that returns `vector` after `delay` seconds."""
+    async def embed():
+        await asyncio.sleep(delay)
+        return list(vector)
+    return AsyncMock(side_effect=embed)
+
+
+class FakeRedis:
+    """Stand-in for redis.asyncio.Redis (get / set with expiry)."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, name):
+        return self.data.get(name)
+
+    async def set(self, name, value, ex=None):
+        self.data[name] = value
+
+# --- Tests ---
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUVectorCache(max_entries=2)
+    lru.put(b"a", np.zeros(1))
+    lru.put(b"b", np.zeros(1))
+    lru.get(b"a")
+    lru.put(b"c", np.zeros(1))
+
+    assert lru.get(b"b") is None
+    assert lru.get(b"a") is not None and lru.get(b"c") is not None
+
+
+def test_repeated_queries_embed_once():
+    cache = QueryEmbeddingCache("hashing:4", max_entries=10)
+    embed = embedder()
+
+    async def run():
+        first = await cache.get_or_embed("What is the vacation policy?", embed)
+        second = await cache.get_or_embed("  what is the Vacation policy ", embed)
+        return first, second
+    first, second = asyncio.run(run())
+
+    assert embed.await_count == 1
+    assert first is second
+    assert first.dtype == np.float32 and not first.flags.writeable
+    assert cache.key("x") != QueryEmbeddingCache("openai:text-embedding-3-small:4", 10).key("x")
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = QueryEmbeddingCache("hashing:4", max_entries=10)
+    embed = embedder(delay=0.05)
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_embed("faq: reset password", embed) for _ in range(5)))
+    results = asyncio.run(run())
+
+    assert embed.await_count == 1
+    assert all(np.array_equal(r, results[0]) for r in results)
+
+
+def test_mmap_tier_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "query-cache.bin")
+    worker_a = QueryEmbeddingCache("hashing:4", 10, MmapVectorStore(path, dimension=4, slots=64))
+    worker_b = QueryEmbeddingCache("hashing:4", 10, MmapVectorStore(path, dimension=4, slots=64))
+    embed_a, embed_b = embedder(), embedder()
+
+    asyncio.run(worker_a.get_or_embed("vpn setup", embed_a))
+    vector = asyncio.run(worker_b.get_or_embed("vpn setup", embed_b))
+
+    assert embed_a.await_count == 1 and embed_b.await_count == 0
+    np.testing.assert_allclose(vector, [0.6, 0.8, 0.0, 0.0], rtol=1e-6)
+
+
+def test_mmap_tier_concurrent_creation_maps_one_file(tmp_path):
+    path = str(tmp_path / "query-cache.bin")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        stores = list(pool.map(lambda _: MmapVectorStore(path, dimension=4, slots=64), range(8)))
+
+    key = bytes(range(16))
+    asyncio.run(stores[0].put(key, np.ones(4, dtype=np.float32)))
+    assert all(asyncio.run(store.get(key)) is not None for store in stores)
+
+
+def test_mmap_tier_rejects_torn_slots_and_handles_full_sets(tmp_path):
+    store = MmapVectorStore(str(tmp_path / "query-cache.bin"), dimension=4, slots=4)  # One set
+    keys = [bytes([i]) * 16 for i in range(1, 7)]
+    for i, key in enumerate(keys):
+        asyncio.run(store.put(key, np.full(4, i, dtype=np.float32)))
+
+    found = [asyncio.run(store.get(key)) for key in keys]
+    assert sum(v is not None for v in found) == 4  # Set holds WAYS entries
+    np.testing.assert_array_equal(found[-1], np.full(4, 5, dtype=np.float32))
+
+    # Simulate a write racing a read: vector changed, checksum not yet updated
+    slot = [store._digests[s].tobytes() for s in range(4)].index(keys[-1])
+    store._vectors[slot] = np.zeros(4, dtype=np.float32)
+    assert asyncio.run(store.get(keys[-1])) is None
+
+    # Reopening with another dimension rebuilds the file instead of misreading it
+    assert asyncio.run(MmapVectorStore(store.path, dimension=8, slots=4).get(keys[0])) is None
+
+
+def test_redis_tier_and_failing_tier():
+    redis = FakeRedis()
+    cache = QueryEmbeddingCache("hashing:4", 10, RedisVectorStore(redis, dimension=4, ttl_seconds=60))
+    asyncio.run(cache.get_or_embed("expense limits", embedder()))
+    assert len(redis.data) == 1
+
+    fresh_worker = QueryEmbeddingCache("hashing:4", 10, RedisVectorStore(redis, dimension=4, ttl_seconds=60))
+    embed = embedder()
+    asyncio.run(fresh_worker.get_or_embed("Expense limits?", embed))
+    assert embed.await_count == 0
+
+    broken = AsyncMock()
+    broken.get.side_effect = ConnectionError("redis down")
+    broken.put.side_effect = ConnectionError("redis down")
+    vector = asyncio.run(QueryEmbeddingCache("hashing:4", 10, broken).get_or_embed("expense limits", embedder()))
+    np.testing.assert_allclose(vector, [0.6, 0.8, 0.0, 0.0], rtol=1e-6)
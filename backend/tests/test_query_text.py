@@ -0,0 +1,35 @@
+"""
+Query Text Tests
+----------------
+1. Normalisation used for dedup / cache keys.
+2. Query-aware citation snippets and highlight offsets.
+"""
+
+from app.services.query_text import make_snippet, normalize_query
+
+
+def test_normalize_query():
+    assert normalize_query("  What is  DocuMind?? ") == normalize_query("what is documind")
+
+
+def test_snippet_centres_on_query_terms():
+    content = "Intro filler. " * 30 + "Nahasat is a skilled AI engineer. " + "Outro filler. " * 30
+    snippet, highlights = make_snippet(content, "Who is Nahasat, the engineer?", width=120)
+
+    assert "Nahasat is a skilled AI engineer" in snippet
+    assert snippet.startswith("...") and snippet.endswith("...")
+    assert [snippet[s:e] for s, e in highlights] == ["Nahasat", "engineer"]
+
+
+def test_snippet_falls_back_to_chunk_opening():
+    snippet, highlights = make_snippet("Quarterly revenue grew.\n\nCosts fell.", "hello")
+    assert snippet == "Quarterly revenue grew. Costs fell."
+    assert highlights == []
+
+
+def test_snippet_after_long_unbroken_token():
+    content = "a" * 500 + " vpn reset steps: open the portal and request a new token."
+    snippet, highlights = make_snippet(content, "vpn reset", width=120)
+
+    assert "vpn reset steps" in snippet
+    assert [snippet[s:e] for s, e in highlights] == ["vpn", "reset"]
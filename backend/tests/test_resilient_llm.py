@@ -0,0 +1,113 @@
+"""
+Resilient LLM Tests
+-------------------
+Runs HedgedChatModel against a local fake completion server (real HTTP):
+1. A fast primary answers alone (no hedge).
+2. A slow primary is hedged; the secondary wins and the primary is cancelled.
+3. A failing primary falls back to the secondary.
+4. The hedge budget caps how often hedges are sent.
+5. The node deadline raises TimeoutError.
+6. Hedges need a free admission slot; the hedge delay uses the primary's own latency.
+"""
+
+import asyncio
+import time
+import pytest
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_openai import ChatOpenAI
+from app.core.metrics import metrics
+from app.services.admission import ConcurrencyBudget
+from app.services.resilient_llm import HedgedChatModel
+from tests.fake_llm_server import FakeCompletionServer
+
+# --- Fixtures ---
+
+@pytest.fixture
+def server():
+    with FakeCompletionServer() as s:
+        yield s
+
+
+def model(server, name):
+    return ChatOpenAI(model=name, api_key="sk-test", base_url=server.base_url, max_retries=0)
+
+
+def ask(llm, node="test"):
+    """Runs a real prompt | llm | parser chain, returns (answer, seconds)."""
+    chain = ChatPromptTemplate.from_template("Q: {q}") | llm.for_node(node) | StrOutputParser()
+    started = time.perf_counter()
+    answer = asyncio.run(chain.ainvoke({"q": "hello"}))
+    return answer, time.perf_counter() - started
+
+# --- Tests ---
+
+def test_fast_primary_is_not_hedged(server):
+    llm = HedgedChatModel(model(server, "primary"), model(server, "secondary"), initial_hedge_delay=1.0)
+    answer, _ = ask(llm)
+
+    assert answer == "answer from primary"
+    assert server.calls == ["primary"]
+
+
+def test_slow_primary_is_hedged(server):
+    wins = metrics.counter("llm_hedge_wins_total").value
+    llm = HedgedChatModel(model(server, "slow-3"), model(server, "secondary"), initial_hedge_delay=0.1)
+    answer, elapsed = ask(llm)
+
+    assert answer == "answer from secondary"
+    assert elapsed < 2.0
+    assert server.calls == ["slow-3", "secondary"]
+    assert metrics.counter("llm_hedge_wins_total").value == wins + 1
+
+
+def test_failing_primary_falls_back(server):
+    llm = HedgedChatModel(model(server, "fail"), model(server, "secondary"), initial_hedge_delay=5.0)
+    answer, elapsed = ask(llm)
+
+    assert answer == "answer from secondary"
+    assert elapsed < 2.0
+
+
+def test_hedge_budget_caps_hedges(server):
+    llm = HedgedChatModel(
+        model(server, "slow-0.3"), model(server, "secondary"), initial_hedge_delay=0.05, hedge_max_ratio=0.0
+    )
+    llm._hedge_tokens = 1.0  # Exactly one hedge available
+
+    assert ask(llm)[0] == "answer from secondary"
+    assert ask(llm)[0] == "answer from slow-0.3"
+    assert server.calls.count("secondary") == 1
+
+
+def test_node_deadline(server):
+    llm = HedgedChatModel(model(server, "slow-3"), None, node_timeouts={"router": 0.2})
+    with pytest.raises(asyncio.TimeoutError):
+        ask(llm, node="router")
+
+
+def test_hedge_needs_a_free_slot(server):
+    budget = ConcurrencyBudget("test_hedge", limit=1, slo_seconds=5.0)
+    llm = HedgedChatModel(
+        model(server, "slow-0.3"), model(server, "secondary"), initial_hedge_delay=0.05, budget=budget
+    )
+    assert budget.try_acquire()  # The node's own slot: nothing left for a hedge
+
+    assert ask(llm)[0] == "answer from slow-0.3"
+    assert "secondary" not in server.calls
+
+    budget.limit = 2
+    assert ask(llm)[0] == "answer from secondary"
+    assert budget.in_flight == 1  # Hedge slot returned
+
+
+def test_hedge_delay_uses_primary_latency(server):
+    llm = HedgedChatModel(model(server, "slow-0.3"), model(server, "secondary"), initial_hedge_delay=0.05)
+    primary = metrics.histogram("llm_hedgedelay_primary_latency_seconds")
+
+    ask(llm, node="hedgedelay")  # Hedged: the cancelled primary reports nothing
+    assert primary.count == 0
+
+    ask(HedgedChatModel(model(server, "primary"), None), node="hedgedelay")
+    assert primary.count == 1
+    assert metrics.histogram("llm_hedgedelay_latency_seconds").count == 2
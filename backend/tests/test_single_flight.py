@@ -0,0 +1,101 @@
+"""
+Single-Flight Tests
+-------------------
+Verifies request coalescing semantics:
+1. Concurrent callers with the same key share one execution.
+2. Followers receive the leader's exception.
+3. Streaming subscribers replay past events and follow live ones.
+4. Completed flights are not cached; in_flight reports only running keys.
+"""
+
+import asyncio
+from app.core.metrics import metrics
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight("test_share")
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"answer": 42}
+
+    async def main():
+        return await asyncio.gather(*(flights.do("q", work) for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert all(r == {"answer": 42} for r in results)
+    assert metrics.counter("test_share_singleflight_followers_total").value == 9
+    assert metrics.counter("test_share_singleflight_saved_seconds_total").value > 0
+
+
+def test_followers_receive_leader_exception():
+    flights = SingleFlight("test_error")
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("LLM down")
+
+    async def main():
+        return await asyncio.gather(*(flights.do("q", boom) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_stream_subscribers_replay_and_follow():
+    flights = SingleFlight("test_stream")
+
+    async def events():
+        for i in range(3):
+            yield i
+            await asyncio.sleep(0.02)
+
+    async def collect(delay):
+        await asyncio.sleep(delay)
+        return [e async for e in flights.subscribe("q", events)]
+
+    async def main():
+        # Second subscriber joins after the first event was emitted
+        return await asyncio.gather(collect(0), collect(0.03))
+
+    early, late = asyncio.run(main())
+    assert early == late == [0, 1, 2]
+
+
+def test_completed_flights_are_not_cached():
+    flights = SingleFlight("test_nocache")
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def main():
+        return [await flights.do("q", work), await flights.do("q", work)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_in_flight_tracks_running_keys():
+    flights = SingleFlight("test_inflight")
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "done"
+
+    async def main():
+        call = asyncio.create_task(flights.do("q", work))
+        await asyncio.sleep(0)
+        running = flights.in_flight("q"), flights.in_flight("other")
+        release.set()
+        await call
+        return running, flights.in_flight("q")
+
+    assert asyncio.run(main()) == ((True, False), False)
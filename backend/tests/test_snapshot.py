@@ -0,0 +1,133 @@
+"""
+Snapshot Tests
+--------------
+Verifies the binary snapshot format without a database:
+1. Written columns read back unchanged; embeddings are a plain float32 file.
+2. COPY records carry pgvector's binary encoding and restore SQL NULLs.
+3. The binary COPY decoder handles arbitrarily split network reads.
+4. Incomplete or mismatched snapshots are rejected.
+5. Truncated or corrupt column files raise SnapshotError before anything is mapped.
+"""
+
+import asyncio
+import json
+import struct
+import uuid
+from datetime import datetime
+import numpy as np
+import pytest
+from app.services.snapshot import (
+    Snapshot, SnapshotError, SnapshotWriter, _VectorCopyDecoder, import_snapshot, vector_wire_dtype
+)
+
+# --- Fixtures ---
+
+IDS = [uuid.uuid4() for _ in range(3)]
+CREATED = datetime(2024, 6, 1, 12, 30, 15, 123456)
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    writer = SnapshotWriter(tmp_path / "snap", dimension=4)
+    writer.add_rows(
+        ids=[i.bytes for i in IDS[:2]],
+        filenames=["hr.pdf", "hr.pdf"],
+        chunk_indexes=[0, 1],
+        contents=["Vacation policy", "Überstunden: 10 €"],
+        metadata=['{"page": 1}', None],
+        created_at=[CREATED, CREATED],
+    )
+    writer.add_rows([IDS[2].bytes], ["it.pdf"], [0], ["VPN setup"], ['{"page": 3}'], [CREATED])
+    writer.add_embeddings(np.arange(12, dtype=np.float32).reshape(3, 4) / 10)
+    writer.close("hashing:4")
+    return tmp_path / "snap"
+
+# --- Tests ---
+
+def test_round_trip(snapshot_dir):
+    snapshot = Snapshot(snapshot_dir)
+
+    assert (snapshot.rows, snapshot.dimension, snapshot.embedding_model) == (3, 4, "hashing:4")
+    assert snapshot.manifest["documents"] == 2
+    assert snapshot.content.slice(0, 3) == ["Vacation policy", "Überstunden: 10 €", "VPN setup"]
+    assert snapshot.content[1] == "Überstunden: 10 €"
+    # Memory-mappable without any reader code
+    raw = np.fromfile(snapshot_dir / "embeddings.f32", dtype="<f4").reshape(3, 4)
+    np.testing.assert_array_equal(raw, np.arange(12, dtype=np.float32).reshape(3, 4) / 10)
+
+
+def test_records_for_copy(snapshot_dir):
+    records = Snapshot(snapshot_dir).records(1, 3)
+
+    assert [r[0] for r in records] == IDS[1:]
+    assert [r[1] for r in records] == ["hr.pdf", "it.pdf"]
+    assert records[0][4] is None  # SQL NULL metadata survives
+    assert records[1][4] == '{"page": 3}'
+    assert records[0][6] == CREATED
+
+    dim, unused = struct.unpack(">HH", records[1][5][:4])
+    values = np.frombuffer(records[1][5][4:], dtype=">f4")
+    assert (dim, unused) == (4, 0)
+    np.testing.assert_array_equal(values, np.array([0.8, 0.9, 1.0, 1.1], dtype=np.float32))
+
+
+def test_copy_decoder_handles_split_reads():
+    vectors = np.random.default_rng(0).standard_normal((5, 4)).astype(np.float32)
+    tuples = np.empty(5, dtype=[("fields", ">i2"), ("length", ">i4"), ("vector", vector_wire_dtype(4))])
+    tuples["fields"], tuples["length"] = 1, 4 + 16
+    tuples["vector"]["dim"], tuples["vector"]["unused"] = 4, 0
+    tuples["vector"]["values"] = vectors
+    stream = b"PGCOPY\n\xff\r\n\x00" + bytes(8) + tuples.tobytes() + b"\xff\xff"
+
+    received = []
+    decoder = _VectorCopyDecoder(4, lambda v: received.append(np.array(v, dtype=np.float32)))
+
+    async def feed():
+        for lo in range(0, len(stream), 7):
+            await decoder.feed(stream[lo:lo + 7])
+    asyncio.run(feed())
+    decoder.finish()
+
+    np.testing.assert_array_equal(np.concatenate(received), vectors)
+
+
+def test_rejects_bad_snapshots(snapshot_dir, tmp_path):
+    with pytest.raises(SnapshotError):
+        SnapshotWriter(snapshot_dir, dimension=4)  # Never overwrite
+
+    writer = SnapshotWriter(tmp_path / "partial", dimension=4)
+    writer.add_rows([IDS[0].bytes], ["a.pdf"], [0], ["text"], [None], [CREATED])
+    with pytest.raises(SnapshotError):
+        writer.close("hashing:4")  # No embeddings
+    with pytest.raises(SnapshotError):
+        Snapshot(tmp_path / "partial")  # No manifest
+
+    # 4-dim vectors cannot go into this deployment's column (checked before connecting)
+    with pytest.raises(SnapshotError):
+        asyncio.run(import_snapshot(snapshot_dir))
+
+
+@pytest.mark.parametrize("name, corrupt", [
+    ("embeddings.f32", lambda raw: raw[:-4]),                 # Truncated mid-vector
+    ("created_at.i64", lambda raw: raw + b"\0" * 8),          # Extra row
+    ("content.off", lambda raw: raw[:-8]),                    # Missing final offset
+    ("content.bin", lambda raw: raw[:-1]),                    # Offsets point past the end
+    ("ids.uuid", lambda raw: b""),
+])
+def test_rejects_corrupt_column_files(snapshot_dir, name, corrupt):
+    path = snapshot_dir / name
+    path.write_bytes(corrupt(path.read_bytes()))
+    with pytest.raises(SnapshotError, match=name.replace(".", r"\.")):
+        Snapshot(snapshot_dir)
+
+
+def test_rejects_malformed_manifest(snapshot_dir):
+    manifest = json.loads((snapshot_dir / "manifest.json").read_text())
+    del manifest["columns"]["content"]
+    (snapshot_dir / "manifest.json").write_text(json.dumps(manifest))
+    with pytest.raises(SnapshotError, match="Malformed"):
+        Snapshot(snapshot_dir)
+
+    (snapshot_dir / "manifest.json").write_text("{not json")
+    with pytest.raises(SnapshotError, match="Malformed"):
+        Snapshot(snapshot_dir)
@@ -9,6 +9,7 @@ export interface Citation {
     page: number;
     text_snippet: string;
     score: number;
+    highlights?: [number, number][]; // Offsets of query terms in text_snippet
 }
 
 export interface ChatResponse {